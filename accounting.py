@@ -1,14 +1,18 @@
 from dataclasses import dataclass
-from config_manager import ConfigManager
-from typing import Dict, List, Optional, Tuple
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple
 from decimal import Decimal
 import json
 from pathlib import Path
+from season_model import REGULAR_SEASON_WEEKS, SeasonModel, season_files
+from survivor_engine import SurvivorEngine
+
+if TYPE_CHECKING:
+    from config_manager import ConfigManager
 
 @dataclass
 class LeagueFinances:
     """Constants for league financial structure"""
-    def __init__(self, config: ConfigManager):
+    def __init__(self, config: 'ConfigManager'):
         self.BUY_IN = config.financial.buy_in
         self.FIRST_PLACE = config.financial.first_place
         self.SECOND_PLACE = config.financial.second_place
@@ -30,77 +34,72 @@ class LeagueFinances:
                 self.SURVIVOR_BONUS + self.HIGH_POINTS_BONUS)
 
 class LeagueAccounting:
-    def __init__(self, storage_manager, config: ConfigManager, yahoo_api=None):
+    def __init__(self, storage_manager, config: 'ConfigManager', yahoo_api=None,
+                 regular_season_weeks: int = REGULAR_SEASON_WEEKS):
         self.storage = storage_manager
         self.yahoo_api = yahoo_api
         self.finances = LeagueFinances(config)
         self.payments: Dict[str, Decimal] = {}
         self.total_collected = Decimal('0.00')
+        # Season aggregates and derived winnings, rebuilt only when stored data changes
+        self._model: Optional[SeasonModel] = None
+        self._model_signature: Optional[tuple] = None
+        self._winnings: Optional[Dict[str, Decimal]] = None
+        self._winnings_signature: Optional[tuple] = None
+        self._playoff_winnings: Optional[Dict[str, Decimal]] = None
+        self.regular_season_weeks = regular_season_weeks
+        self.league_id = config.league.league_id
+        self.game_key = config.league.game_key
+        self.backend = config.accounting.backend
+        if self.backend == 'numpy' and not self._numpy_available():
+            print("[!] numpy is not installed, using the python accounting backend")
+            self.backend = 'python'
         self.load_payment_status()
 
+    @staticmethod
+    def _numpy_available() -> bool:
+        import score_matrix  # Loads numpy, so only when the numpy backend is selected
+        return score_matrix.available()
+
+    @property
+    def season_model(self) -> SeasonModel:
+        """Get the season model, rebuilding it if any week, team or skins file changed"""
+        signature = self.storage.data_signature(season_files(self.regular_season_weeks))
+        if self._model is None or signature != self._model_signature:
+            self._model = SeasonModel.build(self.storage, self.regular_season_weeks, self.backend)
+            self._model_signature = signature
+        return self._model
+
     def process_survivor_bonus(self) -> Optional[str]:
         """Process survivor bonus competition"""
         print("\n" + "*" * 40 + " Survivor Results " + "*" * 40)
         
-        all_weeks_data = []
-        for week in range(1, 14):
-            week_data = self.storage.load_data(f'week_{week}_matchup.json')
-            if week_data:
-                all_weeks_data.append(week_data)
-
-        teams_info = self.storage.load_data('teams_info.json')
-        if not teams_info:
+        if not self.storage.load_data('teams_info.json'):
             print("[!] No teams info found")
             return None
 
-        active_teams = {team['team_key']: team['team_name'] for team in teams_info}
-
-        for week_data in all_weeks_data:
-            if not week_data:
-                continue
-
-            scores = {}
-            for matchup in week_data:
-                if matchup['team_key'] in active_teams:
-                    scores[matchup['team_key']] = float(matchup['team_points'])
-                if matchup['opponent_team_key'] in active_teams:
-                    scores[matchup['opponent_team_key']] = float(matchup['opponent_points'])
-
-            if not scores:
-                continue
-
-            lowest_team_key = min(scores, key=scores.get)
-            lowest_team_name = active_teams[lowest_team_key]
-            lowest_score = scores[lowest_team_key]
-
-            print(f"[*] Week {week_data[0]['week']} eliminated: {lowest_team_name} with {lowest_score} points")
-            del active_teams[lowest_team_key]
+        standings = SurvivorEngine(self.storage, self.regular_season_weeks).update()
+        for elimination in standings['eliminations']:
+            print(f"[*] Week {elimination['week']} eliminated: {elimination['team_name']} "
+                  f"with {elimination['points']} points")
 
-            if len(active_teams) == 1:
-                winner_key = next(iter(active_teams))
-                winner_name = active_teams[winner_key]
-                print(f"[+] Survivor bonus winner: {winner_name}!")
-                self.storage.save_data('survivor.json', {
-                    'winner': winner_name,
-                    'bonus': float(self.finances.SURVIVOR_BONUS)
-                })
-                return winner_name
+        winner = standings['winner']
+        if winner:
+            print(f"[+] Survivor bonus winner: {winner}!")
+            self.storage.save_data('survivor.json', {
+                'winner': winner,
+                'bonus': float(self.finances.SURVIVOR_BONUS)
+            })
             
-        return None
+        return winner
+
     def generate_balance_sheet(self) -> str:
         """Generate a detailed balance sheet showing dues and winnings for each team"""
         # Get all winnings
         all_winnings = self.calculate_all_winnings()
         
-        # Get all teams from latest standings or matchup data
-        all_teams = set()
-        # Check matchup data for weeks 1-13 to get all team names
-        for week in range(1, 14):
-            week_data = self.storage.load_data(f'week_{week}_matchup.json')
-            if week_data:
-                for matchup in week_data:
-                    all_teams.add(matchup['team_name'])
-                    all_teams.add(matchup['opponent_name'])
+        # Get all teams from matchup data for weeks 1-13
+        all_teams = self.season_model.team_names
         
         # Create balance sheet entries
         report = []
@@ -157,15 +156,18 @@ class LeagueAccounting:
         return "\n".join(report)
 
     def get_playoff_winnings(self) -> Dict[str, Decimal]:
-        """Get playoff winnings based on final standings"""
+        """Get playoff winnings based on final standings, fetched once per instance"""
         if not self.yahoo_api:
             return {}
+        if self._playoff_winnings is not None:
+            return self._playoff_winnings
         
-        # Get game key and league ID from league key format "449.l.410864"
-        game_key = "449"  # Hard-coded from your league key
-        league_id = "410864"  # Hard-coded from your league key
+        # League key format is "<game_key>.l.<league_id>"; no game key means the current season
+        game_key = self.game_key or self.yahoo_api.get_game_key()
+        if not game_key:
+            return {}
         
-        standings = self.yahoo_api.get_final_standings(game_key, league_id)
+        standings = self.yahoo_api.get_final_standings(game_key, self.league_id)
         if not standings:
             return {}
             
@@ -179,6 +181,7 @@ class LeagueAccounting:
         for team in standings:
             winnings[team['name']] = payouts[team['rank']]
             
+        self._playoff_winnings = winnings
         return winnings
 
     def load_payment_status(self) -> None:
@@ -197,51 +200,15 @@ class LeagueAccounting:
 
     def calculate_total_points(self) -> Dict[str, float]:
         """Calculate total points for each team from weekly data"""
-        team_points = {}
-        
-        # Process weeks 1-13 (regular season)
-        for week in range(1, 14):
-            week_data = self.storage.load_data(f'week_{week}_matchup.json')
-            if not week_data:
-                continue
-                
-            for matchup in week_data:
-                # Add team points
-                team_name = matchup['team_name']
-                if team_name not in team_points:
-                    team_points[team_name] = 0.0
-                team_points[team_name] += float(matchup['team_points'])
-                
-                # Add opponent points
-                opp_name = matchup['opponent_name']
-                if opp_name not in team_points:
-                    team_points[opp_name] = 0.0
-                team_points[opp_name] += float(matchup['opponent_points'])
-        
-        return team_points
+        return dict(self.season_model.total_points)
 
     def get_highest_points_winner(self) -> Optional[Tuple[str, float]]:
         """Get the team with the highest total points through week 13"""
-        total_points = self.calculate_total_points()
-        if not total_points:
-            return None
-        return max(total_points.items(), key=lambda x: x[1])
+        return self.season_model.highest_points
 
     def calculate_skins_winnings(self) -> Dict[str, Decimal]:
         """Get total skins winnings per team from stored results"""
-        skins_data = self.storage.load_data('skins_winners.json')
-        if not skins_data:
-            return {}
-            
-        team_totals = {}
-        for team, wins in skins_data.items():
-            # Skip malformed entries
-            if not isinstance(wins, list):
-                continue
-            # Sum up all pot winnings for this team
-            team_totals[team] = sum(Decimal(str(win['pot_winnings'])) for win in wins)
-        
-        return team_totals
+        return dict(self.season_model.skins_totals)
 
     def generate_skins_report(self) -> str:
         """Generate detailed skins report"""
@@ -249,8 +216,8 @@ class LeagueAccounting:
         report.append("\nSKINS BREAKDOWN:")
         report.append("-" * 20)
         
-        # Load raw skins data for detailed info
-        skins_data = self.storage.load_data('skins_winners.json')
+        # Raw skins data for detailed info
+        skins_data = self.season_model.skins_wins
         if not skins_data:
             report.append("No skins winners recorded")
             return "\n".join(report)
@@ -295,44 +262,26 @@ class LeagueAccounting:
         if survivor_data and 'winner' in survivor_data:
             return survivor_data['winner']
         
-        # If not stored, calculate from weekly data
-        active_teams = set()
-        
-        # Process each week to track eliminations
-        for week in range(1, 14):
-            week_data = self.storage.load_data(f'week_{week}_matchup.json')
-            if not week_data:
-                continue
-                
-            # First week, initialize active teams
-            if week == 1:
-                active_teams = {matchup['team_name'] for matchup in week_data}
-                continue
-            
-            # Get scores for active teams
-            scores = {}
-            for matchup in week_data:
-                if matchup['team_name'] in active_teams:
-                    scores[matchup['team_name']] = float(matchup['team_points'])
-            
-            if scores:
-                # Eliminate lowest scoring team
-                eliminated = min(scores.items(), key=lambda x: x[1])[0]
-                active_teams.remove(eliminated)
-                
-                # If only one team remains, they're the winner
-                if len(active_teams) == 1:
-                    winner = next(iter(active_teams))
-                    # Store for future reference
-                    self.storage.save_data('survivor.json', {
-                        'winner': winner,
-                        'bonus': float(self.finances.SURVIVOR_BONUS)
-                    })
-                    return winner
-        
-            return None
+        # If not stored, take it from the season model
+        winner = self.season_model.survivor_winner
+        if winner:
+            # Store for future reference
+            self.storage.save_data('survivor.json', {
+                'winner': winner,
+                'bonus': float(self.finances.SURVIVOR_BONUS)
+            })
+        return winner
 
     def calculate_all_winnings(self) -> Dict[str, Decimal]:
+        """Get every team's total winnings, memoized until stored data changes"""
+        signature = self.storage.data_signature(season_files(self.regular_season_weeks) + ['survivor.json'])
+        if self._winnings is None or signature != self._winnings_signature:
+            self._winnings = self._compute_all_winnings()
+            # Computing may store survivor.json, so fingerprint after the fact
+            self._winnings_signature = self.storage.data_signature(season_files(self.regular_season_weeks) + ['survivor.json'])
+        return dict(self._winnings)
+
+    def _compute_all_winnings(self) -> Dict[str, Decimal]:
         winnings = {}
         
         # Add playoff winnings
@@ -0,0 +1,102 @@
+from pathlib import Path
+from typing import Dict, List, Optional
+from datetime import datetime
+import gzip
+import hashlib
+import json
+import os
+
+class BackupStore:
+    """Content-addressed, deduplicated backups for StorageManager files
+
+    Each file gets a small version index listing its last few content hashes.
+    Contents are stored once per hash, optionally gzip-compressed, so backing
+    up unchanged content costs no copy and restore/retention never scan the
+    backup directory.
+    """
+
+    def __init__(self, backup_dir: Path, keep: int = 5, compress: bool = True):
+        self.backup_dir = Path(backup_dir)
+        self.keep = keep
+        self.compress = compress
+        self.objects_dir = self.backup_dir / 'objects'
+        self.index_dir = self.backup_dir / 'index'
+        self.objects_dir.mkdir(parents=True, exist_ok=True)
+        self.index_dir.mkdir(parents=True, exist_ok=True)
+
+    def _index_path(self, filename: str) -> Path:
+        return self.index_dir / f"{filename}.json"
+
+    def _object_path(self, filename: str, version: Dict) -> Path:
+        # Objects are namespaced per file so retention only has to check one index
+        suffix = '.gz' if version.get('compressed') else ''
+        return self.objects_dir / filename / f"{version['hash']}{suffix}"
+
+    def versions(self, filename: str) -> List[Dict]:
+        """Get a file's backup versions, oldest first"""
+        try:
+            with self._index_path(filename).open('r') as f:
+                return json.load(f)['versions']
+        except (FileNotFoundError, json.JSONDecodeError, KeyError):
+            return []
+
+    def _save_versions(self, filename: str, versions: List[Dict]) -> None:
+        temp_path = self._index_path(filename).with_suffix('.tmp')
+        with temp_path.open('w') as f:
+            json.dump({'versions': versions}, f)
+        os.replace(temp_path, self._index_path(filename))
+
+    def backup(self, file_path: Path) -> None:
+        """Back up a file's current content unless it is already the latest version"""
+        if not file_path.exists():
+            return
+
+        filename = file_path.name
+        versions = self.versions(filename)
+        stat = file_path.stat()
+        signature = [stat.st_mtime_ns, stat.st_size]
+        if versions and versions[-1].get('signature') == signature:
+            return  # Untouched since the last backup, skip hashing entirely
+
+        content = file_path.read_bytes()
+        digest = hashlib.sha256(content).hexdigest()
+        if versions and versions[-1]['hash'] == digest:
+            versions[-1]['signature'] = signature
+            self._save_versions(filename, versions)
+            return
+
+        version = {
+            'hash': digest,
+            'timestamp': datetime.now().isoformat(),
+            'size': len(content),
+            'signature': signature,
+            'compressed': self.compress
+        }
+        object_path = self._object_path(filename, version)
+        if not object_path.exists():
+            object_path.parent.mkdir(parents=True, exist_ok=True)
+            temp_path = object_path.with_name(object_path.name + '.tmp')
+            temp_path.write_bytes(gzip.compress(content) if self.compress else content)
+            os.replace(temp_path, object_path)
+
+        # Keep one entry per distinct content, newest last
+        versions = [existing for existing in versions if existing['hash'] != digest]
+        versions.append(version)
+
+        expired, versions = versions[:-self.keep], versions[-self.keep:]
+        for old_version in expired:
+            self._object_path(filename, old_version).unlink(missing_ok=True)
+        self._save_versions(filename, versions)
+
+    def restore(self, filename: str, steps_back: int = 0) -> Optional[bytes]:
+        """Get the content of a backup version, the latest by default"""
+        versions = self.versions(filename)
+        if steps_back >= len(versions):
+            return None
+
+        version = versions[-1 - steps_back]
+        try:
+            content = self._object_path(filename, version).read_bytes()
+        except FileNotFoundError:
+            return None
+        return gzip.decompress(content) if version.get('compressed') else content
@@ -0,0 +1,203 @@
+"""Sync and account for many leagues and past seasons in a pool of worker processes
+
+Targets come from the batch section of config.yaml or from --target
+GAME_KEY.l.LEAGUE_ID arguments. Each target is stored in its own directory
+under batch.data_dir. Every worker shares one rate limiter, served from the
+parent process, and the token.json that the parent verifies before starting.
+"""
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from contextlib import redirect_stdout
+from dataclasses import replace
+from multiprocessing.managers import BaseManager
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+import argparse
+import json
+import os
+import time
+
+import main
+from accounting import LeagueAccounting
+from config_manager import ConfigManager
+from rate_limiter import RateLimiter
+from yahoo_api import YahooFantasyAPI
+
+class RateLimiterManager(BaseManager):
+    """Serves a single RateLimiter to every worker process"""
+
+RateLimiterManager.register('RateLimiter', RateLimiter)
+
+def parse_target(value: str) -> Dict[str, str]:
+    """Parse a league key such as 449.l.410864 into a batch target"""
+    game_key, separator, league_id = value.partition('.l.')
+    if not separator or not game_key or not league_id:
+        raise argparse.ArgumentTypeError("targets look like GAME_KEY.l.LEAGUE_ID, e.g. 449.l.410864")
+    return {'game_key': game_key, 'league_id': league_id}
+
+def target_key(target: Dict) -> str:
+    return f"{target['game_key']}.l.{target['league_id']}"
+
+def time_stage(name: str, func: Callable, stages: List[Dict]):
+    """Run one stage of a target and record how long it took"""
+    start = time.perf_counter()
+    result = func()
+    stages.append({'stage': name, 'seconds': round(time.perf_counter() - start, 4)})
+    return result
+
+def run_target(target: Dict, config_path: Path, week: str, data_root: Path,
+               rate_limiter: Optional[RateLimiter] = None) -> Dict:
+    """Sync one league season into its own storage namespace and run its accounting
+
+    Output goes to batch.log in the namespace so workers don't interleave.
+    """
+    key = target_key(target)
+    namespace = Path(data_root) / key
+    namespace.mkdir(parents=True, exist_ok=True)
+    stages: List[Dict] = []
+    summary = {'target': key, 'data_dir': str(namespace), 'stages': stages, 'error': None}
+    start = time.perf_counter()
+
+    with (namespace / 'batch.log').open('w') as log, redirect_stdout(log):
+        try:
+            config = ConfigManager(config_path)
+            config.league = replace(config.league, league_id=str(target['league_id']),
+                                    game_key=str(target['game_key']))
+            # Workers renew the shared token silently and never prompt
+            yahoo_api, storage = main.setup_apis(config, str(namespace), rate_limiter=rate_limiter,
+                                                 interactive=False)
+            accounting = LeagueAccounting(storage, config, yahoo_api)
+
+            workers = config.sync.workers if config.sync.mode == 'parallel' else 1
+
+            def ingest():
+                # Each week is committed as it finishes, like main()
+                if config.sync.ingest == 'scoreboard':
+                    main.process_scoreboard(yahoo_api, storage, week, config.league.league_id,
+                                            workers, config.league.game_key)
+                else:
+                    main.process_matchups(yahoo_api, storage, week, config.league.league_id,
+                                          workers, config.league.game_key)
+
+            def bonuses():
+                with storage.transaction():
+                    if config.game.skins_game_enabled:
+                        main.calculate_skins_winnings(storage, config)
+                    if config.game.survivor_pool_enabled:
+                        accounting.process_survivor_bonus()
+
+            time_stage('ingest', ingest, stages)
+            time_stage('bonuses', bonuses, stages)
+            time_stage('export', storage.export_season_data, stages)
+            report = time_stage('financial_report', accounting.generate_financial_report, stages)
+            print(report)
+
+            highest = accounting.season_model.highest_points
+            summary.update({
+                'weeks': len(storage.list_weeks_data()),
+                'teams': len(storage.load_data('teams_info.json') or []),
+                'survivor_winner': accounting.season_model.survivor_winner,
+                'highest_points': highest[0] if highest else None,
+                'matchups_cache': dict(yahoo_api.cache_stats),
+            })
+            if yahoo_api.response_cache:
+                yahoo_api.response_cache.flush()
+                summary['response_cache'] = dict(yahoo_api.response_cache.stats)
+        except Exception as e:
+            print(f"[!] An error occurred: {e}")
+            summary['error'] = str(e)
+
+    summary['total_seconds'] = round(time.perf_counter() - start, 4)
+    with (namespace / 'batch_summary.json').open('w') as f:
+        json.dump(summary, f, indent=4)
+    return summary
+
+def verify_token(config: ConfigManager) -> None:
+    """Authenticate once up front so workers all start from a valid token.json"""
+    try:
+        yahoo_api = YahooFantasyAPI(os.environ['YAHOO_CLIENT_ID'], os.environ['YAHOO_CLIENT_SECRET'],
+                                    base_url=config.api.base_url, timeout=config.api.timeout,
+                                    token_refresh_margin=config.api.token_refresh_margin)
+    except KeyError as e:
+        raise EnvironmentError(f"Missing environment variable: {e}")
+    if not yahoo_api.verify_league_access():
+        raise RuntimeError("Unable to access Yahoo Fantasy API")
+
+def run_batch(targets: List[Dict], config_path: Path, week: str = 'a', processes: int = 4,
+              data_root: Optional[Path] = None) -> List[Dict]:
+    """Run every target, in parallel worker processes when processes > 1"""
+    config = ConfigManager(config_path)
+    data_root = Path(data_root or config.batch.data_dir)
+    data_root.mkdir(parents=True, exist_ok=True)
+    summaries = []
+
+    if processes == 1 or len(targets) == 1:
+        rate_limiter = RateLimiter(config.api.requests_per_second, config.api.burst)
+        for target in targets:
+            summaries.append(run_target(target, config_path, week, data_root, rate_limiter))
+            print_progress(summaries[-1])
+    else:
+        with RateLimiterManager() as manager:
+            rate_limiter = manager.RateLimiter(config.api.requests_per_second, config.api.burst)
+            with ProcessPoolExecutor(max_workers=processes) as executor:
+                futures = [executor.submit(run_target, target, config_path, week, data_root, rate_limiter)
+                           for target in targets]
+                for future in as_completed(futures):
+                    summaries.append(future.result())
+                    print_progress(summaries[-1])
+
+    # Report in the order targets were given, not the order they finished
+    order = {target_key(target): index for index, target in enumerate(targets)}
+    summaries.sort(key=lambda summary: order[summary['target']])
+    with (data_root / 'batch_summary.json').open('w') as f:
+        json.dump(summaries, f, indent=4)
+    return summaries
+
+def print_progress(summary: Dict) -> None:
+    if summary['error']:
+        print(f"[!] {summary['target']} failed after {summary['total_seconds']}s: {summary['error']}")
+    else:
+        print(f"[+] {summary['target']} done in {summary['total_seconds']}s")
+
+def print_summaries(summaries: List[Dict]) -> None:
+    """Print one row per target"""
+    print("\n{:<20} {:>10} {:>6} {:<20} {:<20}".format(
+        "Target", "Seconds", "Weeks", "Survivor", "Highest points"))
+    print("-" * 80)
+    for summary in summaries:
+        if summary['error']:
+            print("{:<20} {:>10.4f} {:>6} {}".format(
+                summary['target'], summary['total_seconds'], '-', f"error: {summary['error']}"))
+            continue
+        print("{:<20} {:>10.4f} {:>6} {:<20} {:<20}".format(
+            summary['target'], summary['total_seconds'], summary['weeks'],
+            summary['survivor_winner'] or '-', summary['highest_points'] or '-'))
+
+def main_cli() -> None:
+    parser = argparse.ArgumentParser(description='Batch sync and accounting for many leagues and seasons')
+    parser.add_argument('--config', type=Path, default=main.get_default_config_path(),
+                        help='Path to config.yaml file')
+    parser.add_argument('--target', type=parse_target, action='append',
+                        help='League key GAME_KEY.l.LEAGUE_ID; repeat for more (overrides batch.targets)')
+    parser.add_argument('--processes', type=int,
+                        help='Worker processes (overrides batch.processes)')
+    parser.add_argument('--week', type=main.parse_week, default='a',
+                        help="Week # or 'a' for all")
+    parser.add_argument('--data-dir', type=Path,
+                        help='Root directory for per-target storage (overrides batch.data_dir)')
+    args = parser.parse_args()
+
+    config = ConfigManager(args.config)
+    targets = args.target or [{'game_key': str(target['game_key']), 'league_id': str(target['league_id'])}
+                              for target in config.batch.targets]
+    if not targets:
+        print("[!] No batch targets; set batch.targets in config.yaml or pass --target")
+        return
+
+    verify_token(config)
+    print(f"[*] Running {len(targets)} targets")
+    summaries = run_batch(targets, args.config, args.week, args.processes or config.batch.processes,
+                          args.data_dir)
+    print_summaries(summaries)
+
+if __name__ == "__main__":
+    main_cli()
@@ -0,0 +1,120 @@
+"""Offline end-to-end benchmark of a full-season run against recorded fixtures
+
+Record fixtures once with `python main.py --record fixtures --week a`, then run
+`python benchmark.py --fixtures fixtures` after each change to track wall time,
+HTTP request count and bytes parsed per pipeline stage.
+"""
+from contextlib import redirect_stdout
+from pathlib import Path
+from typing import Callable, Dict, List
+import argparse
+import io
+import json
+import subprocess
+import tempfile
+import time
+
+import main
+from accounting import LeagueAccounting
+from config_manager import ConfigManager
+from fixtures import attach_replay
+from storage_manager import StorageManager
+from yahoo_api import YahooFantasyAPI
+
+def get_commit() -> str:
+    """Get the current git commit, if any"""
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True,
+                              text=True, cwd=Path(__file__).parent, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return 'unknown'
+
+def time_stage(name: str, func: Callable, replay, results: List[Dict]) -> None:
+    """Run one pipeline stage quietly and record its cost"""
+    requests_before, bytes_before = replay.request_count, replay.bytes_served
+    start = time.perf_counter()
+    with redirect_stdout(io.StringIO()):
+        func()
+    results.append({
+        'stage': name,
+        'seconds': round(time.perf_counter() - start, 4),
+        'requests': replay.request_count - requests_before,
+        'bytes': replay.bytes_served - bytes_before,
+    })
+
+def run_benchmark(fixture_dir: Path, config_path: Path, latency: float, ingest: str,
+                  workers: int) -> Dict:
+    """Time a full-season run served entirely from fixtures"""
+    config = ConfigManager(config_path)
+    stages: List[Dict] = []
+
+    with tempfile.TemporaryDirectory() as data_dir:
+        storage = StorageManager(data_dir)
+        yahoo_api = YahooFantasyAPI('offline', 'offline', token_file=str(Path(data_dir) / 'token.json'))
+        replay = attach_replay(yahoo_api, fixture_dir, latency)
+        accounting = LeagueAccounting(storage, config, yahoo_api)
+
+        if ingest == 'scoreboard':
+            ingest_stage = lambda: main.process_scoreboard(yahoo_api, storage, 'a', config.league.league_id,
+                                                           workers, config.league.game_key)
+        else:
+            ingest_stage = lambda: main.process_matchups(yahoo_api, storage, 'a', config.league.league_id,
+                                                         workers, config.league.game_key)
+
+        time_stage('process_matchups', ingest_stage, replay, stages)
+        time_stage('skins', lambda: main.calculate_skins_winnings(storage, config), replay, stages)
+        time_stage('survivor', accounting.process_survivor_bonus, replay, stages)
+        time_stage('export', storage.export_season_data, replay, stages)
+        time_stage('financial_report', accounting.generate_financial_report, replay, stages)
+        time_stage('balance_sheet', accounting.generate_balance_sheet, replay, stages)
+
+    return {
+        'commit': get_commit(),
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'latency': latency,
+        'ingest': ingest,
+        'workers': workers,
+        'stages': stages,
+        'total_seconds': round(sum(stage['seconds'] for stage in stages), 4),
+        'total_requests': sum(stage['requests'] for stage in stages),
+        'total_bytes': sum(stage['bytes'] for stage in stages),
+        'fixture_misses': replay.misses,
+    }
+
+def print_results(results: Dict) -> None:
+    """Print a benchmark run as a table"""
+    print(f"\n[*] Benchmark @ {results['commit']} (latency {results['latency']}s, "
+          f"{results['ingest']} ingest, {results['workers']} workers)")
+    print("{:<20} {:>10} {:>10} {:>12}".format("Stage", "Seconds", "Requests", "Bytes"))
+    print("-" * 55)
+    for stage in results['stages']:
+        print("{:<20} {:>10.4f} {:>10} {:>12}".format(
+            stage['stage'], stage['seconds'], stage['requests'], stage['bytes']))
+    print("-" * 55)
+    print("{:<20} {:>10.4f} {:>10} {:>12}".format(
+        "TOTAL", results['total_seconds'], results['total_requests'], results['total_bytes']))
+    if results['fixture_misses']:
+        print(f"[!] {results['fixture_misses']} requests had no recorded fixture")
+
+def main_cli() -> None:
+    parser = argparse.ArgumentParser(description='Offline full-season benchmark')
+    parser.add_argument('--fixtures', type=Path, required=True,
+                        help='Fixture directory recorded with main.py --record')
+    parser.add_argument('--config', type=Path, default=main.get_default_config_path(),
+                        help='Path to config.yaml file')
+    parser.add_argument('--latency', type=float, default=0.0,
+                        help='Simulated seconds of latency per request')
+    parser.add_argument('--ingest', choices=['team', 'scoreboard'], default='team')
+    parser.add_argument('--workers', type=int, default=1)
+    parser.add_argument('--output', type=Path, default=Path('benchmark_results.jsonl'),
+                        help='Append results here so runs can be compared per commit')
+    args = parser.parse_args()
+
+    results = run_benchmark(args.fixtures, args.config, args.latency, args.ingest, args.workers)
+    print_results(results)
+    with args.output.open('a') as f:
+        f.write(json.dumps(results) + '\n')
+    print(f"[+] Results appended to {args.output}")
+
+if __name__ == "__main__":
+    main_cli()
@@ -1,13 +1,17 @@
-from dataclasses import dataclass
-from typing import Optional
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
 from pathlib import Path
-import yaml
 from decimal import Decimal
+import hashlib
+import json
+import os
+from serializers import FILE_CLASSES, parse_format
 
 @dataclass
 class LeagueConfig:
     """League-specific configuration"""
     league_id: str
+    game_key: Optional[str] = None  # A past season's game key; the current season if unset
 
 @dataclass
 class FinancialConfig:
@@ -37,14 +41,104 @@ class GameConfig:
     survivor_pool_enabled: bool
     skins_game_enabled: bool
 
+@dataclass
+class SyncConfig:
+    """Matchup ingestion settings"""
+    ingest: str = 'team'  # 'team' or 'scoreboard'
+    mode: str = 'sequential'  # 'sequential' or 'parallel'
+    workers: int = 4
+
+@dataclass
+class ApiConfig:
+    """Yahoo API transport settings"""
+    base_url: str = 'https://fantasysports.yahooapis.com/fantasy/v2'
+    timeout: float = 30  # seconds
+    max_retries: int = 3
+    backoff_factor: float = 0.5  # seconds, doubled on each retry
+    backoff_max: float = 30  # seconds
+    pool_size: int = 10
+    requests_per_second: float = 2.0
+    burst: int = 4
+    token_refresh_margin: float = 300  # seconds before expiry to renew the access token
+
+@dataclass
+class CacheConfig:
+    """On-disk Yahoo response cache settings"""
+    enabled: bool = True
+    max_size_mb: float = 100
+    ttl: Dict[str, int] = field(default_factory=dict)  # seconds per endpoint class
+
+@dataclass
+class StorageConfig:
+    """Local league data storage settings"""
+    backend: str = 'json'  # 'json' files or a 'sqlite' database
+    data_dir: str = 'league_data'
+    db_name: str = 'league.db'
+    backup_keep: int = 5  # Distinct versions kept per file
+    backup_compress: bool = True
+    # Serialization format per file class (week, state, season, default),
+    # e.g. 'json', 'json-pretty', 'msgpack' or 'msgpack+zstd'
+    formats: Dict[str, str] = field(default_factory=dict)
+
+@dataclass
+class AccountingConfig:
+    """Season statistics settings"""
+    backend: str = 'python'  # 'python' loops or the 'numpy' score matrix engine
+
+@dataclass
+class MetricsConfig:
+    """Request and stage metrics settings"""
+    enabled: bool = False
+    prometheus_file: str = 'metrics.prom'  # Prometheus text format, in the data directory
+    summary_file: str = 'metrics.json'  # JSON run summary, in the data directory
+
+@dataclass
+class WatchConfig:
+    """Live week watch settings"""
+    min_interval: float = 30  # seconds between polls while scores are changing
+    max_interval: float = 600  # seconds between polls while nothing changes
+    requests_per_hour: float = 120  # hard cap on scoreboard polls
+    survivor_danger: int = 3  # lowest scoring surviving teams to show
+
+@dataclass
+class DaemonConfig:
+    """Unattended daemon settings"""
+    interval: float = 900  # seconds between checks for completed weeks
+
+@dataclass
+class BatchConfig:
+    """Multi-league batch runner settings"""
+    targets: List[Dict[str, str]] = field(default_factory=list)  # game_key and league_id pairs
+    processes: int = 4
+    data_dir: str = 'league_data/batch'  # Each target gets <data_dir>/<game_key>.l.<league_id>
+
+def get_default_config_path() -> Path:
+    """Get the default config path relative to the script directory"""
+    return Path(__file__).parent / 'config.yaml'
+
 class ConfigManager:
-    """Manages loading and validation of configuration"""
+    """Manages loading and validation of configuration
+
+    A validated config is cached as JSON in the user's cache directory, keyed
+    by the file's hash, so PyYAML is only imported when the file changed.
+    """
     
-    def __init__(self, config_path: Path = Path(".\config.yaml")):
+    def __init__(self, config_path: Path = Path(".\config.yaml"), require_league: bool = True):
         self.config_path = config_path
+        # Offline tools that never talk to Yahoo can load a config without a league ID
+        self.require_league = require_league
         self.league: LeagueConfig
         self.financial: FinancialConfig
         self.game: GameConfig
+        self.sync: SyncConfig
+        self.api: ApiConfig
+        self.cache: CacheConfig
+        self.storage: StorageConfig
+        self.accounting: AccountingConfig
+        self.batch: BatchConfig
+        self.watch: WatchConfig
+        self.metrics: MetricsConfig
+        self.daemon: DaemonConfig
         self._load_config()
     
     def _load_config(self) -> None:
@@ -52,23 +146,101 @@ class ConfigManager:
         if not self.config_path.exists():
             raise FileNotFoundError(f"Configuration file not found: {self.config_path}")
             
-        with self.config_path.open('r') as f:
-            config_data = yaml.safe_load(f)
+        raw = self.config_path.read_bytes()
+        digest = hashlib.sha256(raw).hexdigest()
+        config_data = self._load_compiled(digest)
+        compiled = config_data is not None
+        if not compiled:
+            import yaml  # Deferred so commands with a compiled config never load PyYAML
+            config_data = yaml.safe_load(raw) or {}
             
         self.league = LeagueConfig(**config_data.get('league', {}))
         self.financial = FinancialConfig(**config_data.get('financial', {}))
         self.game = GameConfig(**config_data.get('game', {}))
+        self.sync = SyncConfig(**config_data.get('sync', {}))
+        self.api = ApiConfig(**config_data.get('api', {}))
+        self.cache = CacheConfig(**config_data.get('cache', {}))
+        self.storage = StorageConfig(**config_data.get('storage', {}))
+        self.accounting = AccountingConfig(**config_data.get('accounting', {}))
+        self.batch = BatchConfig(**config_data.get('batch', {}))
+        self.watch = WatchConfig(**config_data.get('watch', {}))
+        self.metrics = MetricsConfig(**config_data.get('metrics', {}))
+        self.daemon = DaemonConfig(**config_data.get('daemon', {}))
         
         # Convert financial values to Decimal
         self.financial.to_decimal()
         
         if not self.validate():
             raise ValueError("Invalid configuration")
+
+        # Only a config that validated is compiled, so a broken edit is re-parsed and re-reported
+        if not compiled:
+            self._store_compiled(digest, config_data)
     
+    @property
+    def cache_path(self) -> Path:
+        """Compiled config location, one file per config path, outside the source checkout"""
+        cache_home = Path(os.environ.get('XDG_CACHE_HOME') or Path.home() / '.cache')
+        key = hashlib.sha256(str(self.config_path.resolve()).encode()).hexdigest()[:16]
+        return cache_home / 'fantasy_league' / f'config_{key}.json'
+
+    def _load_compiled(self, digest: str) -> Optional[Dict]:
+        """The compiled config for this exact file content, if cached"""
+        try:
+            with self.cache_path.open('r') as f:
+                cached = json.load(f)
+            if cached.get('hash') == digest:
+                return cached['config']
+        except (OSError, ValueError, KeyError, RuntimeError):
+            pass
+        return None
+
+    def _store_compiled(self, digest: str, config_data: Dict) -> None:
+        """Cache a parsed config, skipping any that JSON can't hold unchanged (dates or int keys)"""
+        try:
+            encoded = json.dumps({'hash': digest, 'config': config_data})
+            if json.loads(encoded)['config'] != config_data:
+                return
+            cache_path = self.cache_path
+            cache_path.parent.mkdir(parents=True, exist_ok=True)
+            temp_path = cache_path.with_name(f"{cache_path.name}.{os.getpid()}.tmp")
+            temp_path.write_text(encoded)
+            os.replace(temp_path, cache_path)
+        except (OSError, TypeError, ValueError, RuntimeError):
+            pass  # No writable cache directory; parse every time
+
     def validate(self) -> bool:
         """Validate entire configuration"""
-        if not self.league.league_id:
+        if self.require_league and not self.league.league_id:
             raise ValueError("League ID must be specified")
+
+        if self.sync.ingest not in ('team', 'scoreboard'):
+            raise ValueError("sync.ingest must be 'team' or 'scoreboard'")
+        if self.sync.mode not in ('sequential', 'parallel'):
+            raise ValueError("sync.mode must be 'sequential' or 'parallel'")
+        if self.sync.workers < 1:
+            raise ValueError("sync.workers must be at least 1")
+        if self.storage.backend not in ('json', 'sqlite'):
+            raise ValueError("storage.backend must be 'json' or 'sqlite'")
+        for file_class, spec in self.storage.formats.items():
+            if file_class not in FILE_CLASSES:
+                raise ValueError(f"storage.formats keys must be one of {FILE_CLASSES}")
+            parse_format(spec)
+        if self.accounting.backend not in ('python', 'numpy'):
+            raise ValueError("accounting.backend must be 'python' or 'numpy'")
+        if not 0 < self.watch.min_interval <= self.watch.max_interval or self.watch.requests_per_hour <= 0:
+            raise ValueError("watch intervals must satisfy 0 < min_interval <= max_interval "
+                             "and requests_per_hour must be positive")
+        if self.daemon.interval <= 0:
+            raise ValueError("daemon.interval must be positive")
+        if self.batch.processes < 1:
+            raise ValueError("batch.processes must be at least 1")
+        if any(not target.get('game_key') or not target.get('league_id') for target in self.batch.targets):
+            raise ValueError("batch.targets entries need a game_key and a league_id")
+        if self.api.timeout <= 0 or self.api.max_retries < 0:
+            raise ValueError("api.timeout must be positive and api.max_retries non-negative")
+        if self.api.token_refresh_margin < 0:
+            raise ValueError("api.token_refresh_margin must be non-negative")
         
         total_payouts = (
             self.financial.first_place + 
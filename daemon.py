@@ -0,0 +1,166 @@
+"""Unattended daemon that processes league weeks as they finish
+
+Keeps one Yahoo session open and checks the league's current week on a
+schedule. Every regular season week that is final but not yet processed
+is ingested, then skins, survivor and the season export are brought up to
+date. Weeks missed while the daemon was down are caught up on the next
+check. Runs never overlap: a lock file makes an overlapping cron run or
+SIGUSR1 trigger skip, and triggers that arrive mid-run collapse into one
+follow-up run.
+
+    python daemon.py            # run as a service
+    python daemon.py --once     # single check, e.g. from cron
+"""
+from datetime import datetime
+from pathlib import Path
+from typing import List, Optional
+import argparse
+import signal
+import threading
+
+import main
+from accounting import LeagueAccounting
+from config_manager import ConfigManager
+from file_lock import FileLock
+from season_model import REGULAR_SEASON_WEEKS
+from storage_manager import StorageManager
+from yahoo_api import YahooFantasyAPI
+
+class LeagueDaemon:
+    """Detects completed weeks and processes each one exactly once"""
+
+    STATE_FILE = 'daemon_state.json'
+    LOCK_FILE = 'daemon.lock'
+
+    def __init__(self, config: ConfigManager, yahoo_api: YahooFantasyAPI, storage: StorageManager):
+        self.config = config
+        self.yahoo_api = yahoo_api
+        self.storage = storage
+        self.accounting = LeagueAccounting(storage, config, yahoo_api)
+        self.lock = FileLock(storage.base_dir / self.LOCK_FILE)
+        self._trigger = threading.Event()
+        self._stopping = False
+
+    @property
+    def league_key(self) -> Optional[str]:
+        game_key = self.config.league.game_key or self.yahoo_api.get_game_key()
+        return f"{game_key}.l.{self.config.league.league_id}" if game_key else None
+
+    def processed_weeks(self) -> List[int]:
+        state = self.storage.load_data(self.STATE_FILE) or {}
+        return list(state.get('processed_weeks', []))
+
+    def completed_weeks(self, league_key: str) -> List[int]:
+        """Regular season weeks that are final and not processed yet, oldest first"""
+        league_info = self.yahoo_api.get_league_info(league_key)
+        if not league_info:
+            return []
+        current_week = int(league_info['current_week'])
+        processed = set(self.processed_weeks())
+
+        completed = []
+        for week in range(1, min(current_week, REGULAR_SEASON_WEEKS) + 1):
+            if week in processed:
+                continue
+            # Earlier weeks are final and come from the response cache after the first check;
+            # the current week is fetched live
+            matchups = self.yahoo_api.get_scoreboard(league_key, [week], fresh=week == current_week).get(week, [])
+            if matchups and all(matchup.get('status') == 'postevent' for matchup in matchups):
+                completed.append(week)
+        return completed
+
+    def process_weeks(self, weeks: List[int]) -> None:
+        """Ingest the given weeks, then update bonuses and the export once for all of them"""
+        config = self.config
+        # The per-team matchups cache lives as long as the session, so drop it before each run
+        self.yahoo_api.clear_matchups_cache()
+        workers = config.sync.workers if config.sync.mode == 'parallel' else 1
+        # Each week is committed as it finishes, so a failure later on keeps the earlier weeks
+        for week in weeks:
+            if config.sync.ingest == 'scoreboard':
+                main.process_scoreboard(self.yahoo_api, self.storage, str(week), config.league.league_id,
+                                        workers, config.league.game_key)
+            else:
+                main.process_matchups(self.yahoo_api, self.storage, str(week), config.league.league_id,
+                                      workers, config.league.game_key)
+
+        with self.storage.transaction():
+            if config.game.skins_game_enabled:
+                main.calculate_skins_winnings(self.storage, config)
+            if config.game.survivor_pool_enabled:
+                self.accounting.process_survivor_bonus()
+
+        self.storage.export_season_data()
+
+        processed = sorted(set(self.processed_weeks()) | set(weeks))
+        self.storage.save_data(self.STATE_FILE, {
+            'processed_weeks': processed,
+            'last_run': datetime.now().isoformat()
+        })
+
+    def check(self) -> Optional[List[int]]:
+        """Process any newly completed weeks; None if another run holds the lock"""
+        if not self.lock.acquire(blocking=False):
+            print("[*] Another run is in progress, skipping this trigger")
+            return None
+        try:
+            league_key = self.league_key
+            if not league_key:
+                print("[!] Failed to get game key")
+                return []
+            weeks = self.completed_weeks(league_key)
+            if weeks:
+                print(f"[*] Processing completed weeks: {', '.join(str(week) for week in weeks)}")
+                self.process_weeks(weeks)
+                print(f"[+] Weeks {', '.join(str(week) for week in weeks)} processed")
+            if self.yahoo_api.response_cache:
+                self.yahoo_api.response_cache.flush()
+            return weeks
+        finally:
+            self.lock.release()
+
+    def trigger(self, *_) -> None:
+        """Request a check now; triggers during a run coalesce into one follow-up check"""
+        self._trigger.set()
+
+    def stop(self, *_) -> None:
+        self._stopping = True
+        self._trigger.set()
+
+    def run(self, interval: float) -> None:
+        """Check on a schedule until stopped"""
+        print(f"[*] Daemon watching league {self.config.league.league_id}, checking every {interval}s")
+        while not self._stopping:
+            self._trigger.clear()
+            try:
+                self.check()
+            except Exception as e:
+                # Keep the service alive through transient API and network failures
+                print(f"[!] Check failed: {e}")
+            self._trigger.wait(interval)
+        print("[*] Daemon stopped")
+
+def main_cli() -> None:
+    parser = argparse.ArgumentParser(description='Process league weeks automatically as they finish')
+    parser.add_argument('--config', type=Path, default=main.get_default_config_path(),
+                        help='Path to config.yaml file')
+    parser.add_argument('--once', action='store_true', help='Run a single check and exit')
+    parser.add_argument('--interval', type=float, help='Seconds between checks (overrides daemon.interval)')
+    parser.add_argument('--data-dir', help='Directory for stored league data (overrides storage.data_dir)')
+    args = parser.parse_args()
+
+    config = ConfigManager(args.config)
+    yahoo_api, storage = main.setup_apis(config, args.data_dir, interactive=False)
+    daemon = LeagueDaemon(config, yahoo_api, storage)
+    if args.once:
+        daemon.check()
+        return
+
+    signal.signal(signal.SIGTERM, daemon.stop)
+    signal.signal(signal.SIGINT, daemon.stop)
+    if hasattr(signal, 'SIGUSR1'):
+        signal.signal(signal.SIGUSR1, daemon.trigger)
+    daemon.run(args.interval or config.daemon.interval)
+
+if __name__ == "__main__":
+    main_cli()
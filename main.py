@@ -1,28 +1,58 @@
 import os
 from typing import List, Dict, Optional
-from decimal import Decimal
 from yahoo_api import YahooFantasyAPI
 from accounting import LeagueAccounting
-from storage_manager import StorageManager
-from config_manager import ConfigManager
+from storage_manager import StorageManager, setup_storage
+from records import MatchupRecord
+from config_manager import ConfigManager, get_default_config_path
+from rate_limiter import RateLimiter
+from metrics import Metrics
+from response_cache import ResponseCache
+from fixtures import attach_recorder, attach_replay
+from skins_engine import SkinsEngine
+from concurrent.futures import ThreadPoolExecutor, as_completed
 import argparse
 from pathlib import Path
 
-# Add this at the top with your other imports
-def get_default_config_path() -> Path:
-    """Get the default config path relative to the script directory"""
-    return Path(__file__).parent / 'config.yaml'
+def setup_apis(config: ConfigManager, data_dir: Optional[str] = None,
+               require_credentials: bool = True,
+               rate_limiter: Optional[RateLimiter] = None,
+               interactive: bool = True) -> tuple[YahooFantasyAPI, StorageManager]:
+    """Setup API and storage connections
 
-def setup_apis() -> tuple[YahooFantasyAPI, StorageManager]:
-    """Setup API and storage connections"""
+    Pass rate_limiter to share one limit between several API clients, and
+    interactive=False for unattended runs that must never prompt.
+    """
     try:
         # Yahoo API setup
-        client_id = os.environ['YAHOO_CLIENT_ID']
-        client_secret = os.environ['YAHOO_CLIENT_SECRET']
-        yahoo_api = YahooFantasyAPI(client_id, client_secret)
+        if require_credentials:
+            client_id = os.environ['YAHOO_CLIENT_ID']
+            client_secret = os.environ['YAHOO_CLIENT_SECRET']
+        else:
+            client_id = os.environ.get('YAHOO_CLIENT_ID', 'offline')
+            client_secret = os.environ.get('YAHOO_CLIENT_SECRET', 'offline')
         
         # Storage setup
-        storage = StorageManager()
+        storage = setup_storage(config, data_dir)
+        if rate_limiter is None:
+            rate_limiter = RateLimiter(config.api.requests_per_second, config.api.burst)
+        response_cache = None
+        if config.cache.enabled:
+            response_cache = ResponseCache(storage.base_dir / 'http_cache',
+                                           max_bytes=int(config.cache.max_size_mb * 1024 * 1024),
+                                           ttls=config.cache.ttl)
+        yahoo_api = YahooFantasyAPI(client_id, client_secret,
+                                    rate_limiter=rate_limiter,
+                                    base_url=config.api.base_url,
+                                    timeout=config.api.timeout,
+                                    max_retries=config.api.max_retries,
+                                    backoff_factor=config.api.backoff_factor,
+                                    backoff_max=config.api.backoff_max,
+                                    pool_size=config.api.pool_size,
+                                    response_cache=response_cache,
+                                    interactive=interactive,
+                                    token_refresh_margin=config.api.token_refresh_margin,
+                                    metrics=Metrics() if config.metrics.enabled else None)
         
         return yahoo_api, storage
     except KeyError as e:
@@ -42,19 +72,57 @@ def get_week_input() -> Optional[str]:
         except ValueError:
             print('[!] Error. Enter valid week number or "a" for all.')
 
-def process_matchups(yahoo_api: YahooFantasyAPI, storage: StorageManager, week: str):
-    """Process matchups for specified week(s)"""
+def load_teams_info(yahoo_api: YahooFantasyAPI, storage: StorageManager, league_id: str,
+                    game_key: Optional[str] = None) -> Optional[List[Dict]]:
+    """Load stored teams info, refetching it from Yahoo if missing or from another season
+
+    game_key selects a past season; the current season is used by default.
+    """
     teams_info = storage.load_data('teams_info.json')
+    game_info = yahoo_api.get_game_info(game_key or 'nfl')
+    if not game_info:
+        print("[!] Failed to get game key")
+        return teams_info
+
+    season = game_info.get('season')
+    if teams_info and all(team.get('season') == season for team in teams_info):
+        return teams_info
+
+    print(f"[!] No teams info found for {season} season. Fetching from Yahoo...")
+    fetched = yahoo_api.get_team_info(game_info['game_id'], league_id)
+    if not fetched:
+        return teams_info
+    storage.save_data('teams_info.json', fetched)
+    return fetched
+
+def get_weeks_to_process(week: str) -> List[int]:
+    """Expand week input into the list of weeks to process"""
+    return list(range(1, 14)) if week == 'a' else [int(week)]
+
+def parse_week(value: str) -> str:
+    """Validate a week given on the command line"""
+    if value.lower() == 'a':
+        return 'a'
+    if value.isdigit() and 1 <= int(value) <= 13:
+        return str(int(value))
+    raise argparse.ArgumentTypeError("weeks should be 1 - 13 or 'a' for all")
+
+def process_matchups(yahoo_api: YahooFantasyAPI, storage: StorageManager, week: str, league_id: str,
+                     workers: int = 1, game_key: Optional[str] = None):
+    """Process matchups for specified week(s)"""
+    teams_info = load_teams_info(yahoo_api, storage, league_id, game_key)
     if not teams_info:
-        print("[!] No teams info found. Fetching from Yahoo...")
-        game_key = yahoo_api.get_game_key()
-        if not game_key:
-            print("[!] Failed to get game key")
-            return
-        teams_info = yahoo_api.get_team_info(game_key, "410864")  # Ulster Nation XIV
-        storage.save_data('teams_info.json', teams_info)
+        return
+
+    weeks_to_process = get_weeks_to_process(week)
 
-    weeks_to_process = range(1, 14) if week == 'a' else [int(week)]
+    if workers > 1:
+        # Each team's payload covers every week, so fetching teams concurrently
+        # warms the matchups cache and the loop below never touches the network
+        last_week = weeks_to_process[-1]
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            list(executor.map(lambda team: yahoo_api.get_matchup_results(team['team_key'], last_week),
+                              teams_info))
     
     for current_week in weeks_to_process:
         print(f"\n{'-' * 40} Week {current_week} {'-' * 40}")
@@ -75,15 +143,106 @@ def process_matchups(yahoo_api: YahooFantasyAPI, storage: StorageManager, week:
             process_single_matchup(matchup_data, team, matchup_results)
             
         if matchup_results:
-            storage.save_data(f'week_{current_week}_matchup.json', matchup_results)
+            save_week(storage, current_week, matchup_results)
+
+    stats = yahoo_api.cache_stats
+    print(f"[*] Matchups cache: {stats['hits']} hits, {stats['misses']} misses")
+
+def process_scoreboard(yahoo_api: YahooFantasyAPI, storage: StorageManager, week: str, league_id: str,
+                       workers: int = 1, game_key: Optional[str] = None):
+    """Process matchups for specified week(s) using league scoreboard requests"""
+    teams_info = load_teams_info(yahoo_api, storage, league_id, game_key)
+    if not teams_info:
+        return
+
+    game_key = game_key or yahoo_api.get_game_key()
+    if not game_key:
+        print("[!] Failed to get game key")
+        return
+
+    weeks_to_process = get_weeks_to_process(week)
+    league_key = f"{game_key}.l.{league_id}"
+
+    if workers > 1 and len(weeks_to_process) > 1:
+        # One request per week in flight at once; each week is written as soon as it arrives
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = {executor.submit(yahoo_api.get_scoreboard, league_key, [current_week]): current_week
+                       for current_week in weeks_to_process}
+            for future in as_completed(futures):
+                current_week = futures[future]
+                try:
+                    scoreboard = future.result()
+                except Exception as e:
+                    print(f"[!] Error getting scoreboard for week {current_week}: {e}")
+                    continue
+                save_scoreboard_week(storage, current_week, scoreboard.get(current_week, []), teams_info)
+        return
+
+    try:
+        scoreboard = yahoo_api.get_scoreboard(league_key, weeks_to_process)
+    except Exception as e:
+        print(f"[!] Error getting scoreboard: {e}")
+        return
+
+    for current_week in weeks_to_process:
+        save_scoreboard_week(storage, current_week, scoreboard.get(current_week, []), teams_info)
+
+def save_scoreboard_week(storage: StorageManager, week: int, matchups: List[Dict], teams_info: List[Dict]):
+    """Save one week of scoreboard matchups if the week is complete"""
+    print(f"\n{'-' * 40} Week {week} {'-' * 40}")
+
+    # Check if week is completed
+    if any(matchup['status'] != 'postevent' for matchup in matchups):
+        print(f"[!] Week {week} is not over yet.")
+        return
+
+    matchup_results = build_week_results(matchups, teams_info)
+    if matchup_results:
+        save_week(storage, week, matchup_results)
+
+def save_week(storage: StorageManager, week: int, matchup_results: List[Dict]):
+    """Save a week's results unless the stored file already holds exactly them
+
+    Rewriting identical content would change the file's fingerprint, so the skins
+    and survivor checkpoints would replay the season on every rerun.
+    """
+    filename = f'week_{week}_matchup.json'
+    if storage.load_data(filename, mutable=True) == matchup_results:
+        print(f"[*] Week {week} unchanged")
+        return
+    storage.save_data(filename, matchup_results)
+
+def build_week_results(matchups: List[Dict], teams_info: List[Dict]) -> List[Dict]:
+    """Build week results from scoreboard matchups in the same order as the per-team path"""
+    by_team = {}
+    for matchup in matchups:
+        team1, team2 = YahooFantasyAPI.get_matchup_teams(matchup)
+        by_team[team1['team_key']] = (matchup['week'], team1, team2)
+        by_team[team2['team_key']] = (matchup['week'], team2, team1)
+
+    matchup_results = []
+    for team in teams_info:
+        if team['team_key'] not in by_team:
+            continue
+        week, own_side, opponent = by_team[team['team_key']]
+        record_matchup(team, week, own_side['points'], opponent, matchup_results)
+    return matchup_results
 
 def process_single_matchup(matchup_data: Dict, team: Dict, matchup_results: List):
     """Process a single matchup and add to results if not already processed"""
     matchup = matchup_data['matchup']['0']['teams']
     team_points = float(matchup['0']['team'][1]['team_points']['total'])
-    opponent_points = float(matchup['1']['team'][1]['team_points']['total'])
-    opponent_name = matchup['1']['team'][0][2]['name']
-    opponent_team_key = matchup['1']['team'][0][0]['team_key']
+    opponent = {
+        'team_key': matchup['1']['team'][0][0]['team_key'],
+        'name': matchup['1']['team'][0][2]['name'],
+        'points': float(matchup['1']['team'][1]['team_points']['total'])
+    }
+    record_matchup(team, matchup_data['matchup']['week'], team_points, opponent, matchup_results)
+
+def record_matchup(team: Dict, week: str, team_points: float, opponent: Dict, matchup_results: List):
+    """Add a matchup to results unless it was already seen from the opponent's side"""
+    opponent_name = opponent['name']
+    opponent_points = opponent['points']
     
     # Check if matchup already processed
     team_exists = any(m['team_name'] == team['team_name'] or m['opponent_name'] == team['team_name'] 
@@ -91,87 +250,25 @@ def process_single_matchup(matchup_data: Dict, team: Dict, matchup_results: List
     
     if not team_exists:
         # Calculate winner and margin
-        if team_points > opponent_points:
-            margin = str(round(team_points - opponent_points, 2))
-            winning_team = team['team_name']
+        record = MatchupRecord.from_points(team, week, team_points, opponent)
+        if record.winning_team == team['team_name']:
             print(f"\033[32m{team['team_name']} {team_points}\033[0m vs {opponent_name} {opponent_points}")
-            print(f"---> {team['team_name']} wins by: {margin}\n")
-        elif opponent_points > team_points:
-            margin = str(round(opponent_points - team_points, 2))
-            winning_team = opponent_name
+            print(f"---> {team['team_name']} wins by: {record.margin_victory}\n")
+        elif record.winning_team == opponent_name:
             print(f"{team['team_name']} {team_points} vs \033[32m{opponent_name} {opponent_points}\033[0m")
-            print(f"---> {opponent_name} wins by: {margin}\n")
+            print(f"---> {opponent_name} wins by: {record.margin_victory}\n")
         else:
-            margin = "tie"
-            winning_team = "tie"
             print(f"\033[31m{team['team_name']} {team_points} vs {opponent_name} {opponent_points}\033[0m\n")
 
-        matchup_results.append({
-            "team_key": team['team_key'],
-            "team_name": team['team_name'],
-            "week": matchup_data['matchup']['week'],
-            "team_points": str(team_points),
-            "opponent_points": str(opponent_points),
-            "opponent_name": opponent_name,
-            "opponent_team_key": opponent_team_key,
-            "margin_victory": margin,
-            "winning_team": winning_team
-        })
+        matchup_results.append(record.to_dict())
 
 def calculate_skins_winnings(storage: StorageManager, config: ConfigManager):
     """Calculate total skins winnings per team based on rolling pot"""
     print("\n" + "*" * 40 + " Skins Results " + "*" * 40)
     
-    skins_winners = {}
-    current_pot = Decimal(str(config.financial.skins_weekly_pot))  # Initial pot value
-    
-    # Process weeks 1-17 (full season)
-    for week in range(1, 18):
-        week_data = storage.load_data(f'week_{week}_matchup.json')
-        if not week_data:
-            continue
-            
-        # Find potential winners (margin >= 20)
-        potential_winners = {}
-        for matchup in week_data:
-            try:
-                margin = Decimal(str(matchup['margin_victory']))
-                if margin >= config.game.skins_min_margin:
-                    winning_team = matchup['winning_team']
-                    if winning_team not in potential_winners or margin > potential_winners[winning_team]['margin']:
-                        potential_winners[winning_team] = {
-                            'margin': margin,
-                            'week': week
-                        }
-            except (ValueError, KeyError):
-                continue  # Skip invalid entries
-                
-        if not potential_winners:
-            # No winner this week, pot increases
-            current_pot += Decimal(str(config.financial.skins_weekly_pot))
-            continue
-            
-        # Get winner with highest margin
-        winner = max(potential_winners.items(), key=lambda x: x[1]['margin'])
-        winner_team, winner_data = winner
-        
-        # Record win in skins_winners
-        if winner_team not in skins_winners:
-            skins_winners[winner_team] = []
-            
-        skins_winners[winner_team].append({
-            'week_number': week,
-            'margin_victory': float(winner_data['margin']),
-            'pot_winnings': float(current_pot)
-        })
-        
-        print(f"[*] Skins winner for week {week}: {winner_team} by {round(float(winner_data['margin']), 2)}")
-        
-        # Save updated skins data
-        storage.save_data('skins_winners.json', skins_winners)
-        
-        # Reset pot for next week
-        current_pot = Decimal(str(config.financial.skins_weekly_pot))
+    # Weeks 1-17 (full season), resumed from the last checkpoint
+    engine = SkinsEngine(storage, config.financial.skins_weekly_pot, config.game.skins_min_margin)
+    return engine.run()
 
 
 def main():
@@ -180,13 +277,35 @@ def main():
         parser = argparse.ArgumentParser(description='Fantasy Football League Manager')
         parser.add_argument('--config', type=Path, default=get_default_config_path(),
                           help='Path to config.yaml file')
+        parser.add_argument('--ingest', choices=['team', 'scoreboard'],
+                          help='Fetch matchups per team or through the league scoreboard (overrides sync.ingest)')
+        parser.add_argument('--mode', choices=['sequential', 'parallel'],
+                          help='Fetch sequentially or concurrently (overrides sync.mode)')
+        parser.add_argument('--workers', type=int,
+                          help='Concurrent requests in parallel mode (overrides sync.workers)')
+        parser.add_argument('--week', type=parse_week,
+                          help="Week # or 'a' for all; skips the interactive prompt")
+        parser.add_argument('--data-dir',
+                          help='Directory for stored league data (overrides storage.data_dir)')
+        parser.add_argument('--record', type=Path,
+                          help='Record every Yahoo response into this fixture directory')
+        parser.add_argument('--replay', type=Path,
+                          help='Serve Yahoo responses from this fixture directory instead of the network')
+        parser.add_argument('--replay-latency', type=float, default=0.0,
+                          help='Simulated seconds of latency per replayed request')
+        parser.add_argument('--reports', action='store_true',
+                          help='Print the financial report and balance sheet after processing')
         args = parser.parse_args()
 
         # Load configuration
         config = ConfigManager(args.config)
         
         # Setup
-        yahoo_api, storage = setup_apis()
+        yahoo_api, storage = setup_apis(config, args.data_dir, require_credentials=not args.replay)
+        if args.replay:
+            attach_replay(yahoo_api, args.replay, args.replay_latency)
+        elif args.record:
+            attach_recorder(yahoo_api, args.record)
         
         # Initialize accounting with config
         accounting = LeagueAccounting(storage, config, yahoo_api)
@@ -197,20 +316,52 @@ def main():
             return
             
         # Get week to process
-        week = get_week_input()
+        week = args.week or get_week_input()
     
         # Process weekly data
-        process_matchups(yahoo_api, storage, week)
+        ingest = args.ingest or config.sync.ingest
+        mode = args.mode or config.sync.mode
+        workers = (args.workers or config.sync.workers) if mode == 'parallel' else 1
+        metrics = yahoo_api.metrics
+        # Every week file is committed on its own as soon as it is built, so an interrupted
+        # ingest keeps the finished weeks; the bonuses then fingerprint committed week files
+        with metrics.span('ingest'):
+            if ingest == 'scoreboard':
+                process_scoreboard(yahoo_api, storage, week, config.league.league_id, workers,
+                                   config.league.game_key)
+            else:
+                process_matchups(yahoo_api, storage, week, config.league.league_id, workers,
+                                 config.league.game_key)
         
         # Calculate bonuses if enabled
-        if config.game.skins_game_enabled:
-            calculate_skins_winnings(storage, config)
-            
-        if config.game.survivor_pool_enabled:
-            accounting.process_survivor_bonus()
+        with storage.transaction():
+            if config.game.skins_game_enabled:
+                with metrics.span('skins'):
+                    calculate_skins_winnings(storage, config)
+                
+            if config.game.survivor_pool_enabled:
+                with metrics.span('survivor'):
+                    accounting.process_survivor_bonus()
 
         # Export season data
-        storage.export_season_data()
+        with metrics.span('export'):
+            storage.export_season_data()
+
+        if args.reports:
+            with metrics.span('reports'):
+                print(accounting.generate_financial_report())
+                print("\n" + "=" * 80)
+                print(accounting.generate_balance_sheet())
+
+        if yahoo_api.response_cache:
+            yahoo_api.response_cache.flush()
+            stats = yahoo_api.response_cache.stats
+            print(f"[*] Response cache: {stats['hits']} hits, {stats['misses']} misses")
+
+        if metrics.enabled:
+            metrics.write(storage.base_dir / config.metrics.prometheus_file,
+                          storage.base_dir / config.metrics.summary_file)
+            print(f"[*] Metrics written to {storage.base_dir / config.metrics.prometheus_file}")
         
         print("[*] Complete!")
         
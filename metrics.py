@@ -0,0 +1,183 @@
+from contextlib import contextmanager, nullcontext
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+import json
+import os
+import re
+import threading
+import time
+
+# Upper bounds in seconds of the request latency histogram buckets
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+# Keys are replaced by placeholders so every league, team and week shares one series
+_TEMPLATE_PATTERNS = [
+    (re.compile(r'\d+\.l\.\d+\.t\.\d+'), '{team_key}'),
+    (re.compile(r'\d+\.l\.\d+'), '{league_key}'),
+    (re.compile(r'week=[\d,]+'), 'week={weeks}'),
+    (re.compile(r'^game/\d+'), 'game/{game_key}'),
+]
+
+def endpoint_template(endpoint: str) -> str:
+    """Collapse an endpoint such as league/449.l.1/scoreboard;week=3 into its template"""
+    for pattern, placeholder in _TEMPLATE_PATTERNS:
+        endpoint = pattern.sub(placeholder, endpoint)
+    return endpoint
+
+def _labels(**labels) -> str:
+    return ','.join(f'{name}="{value}"' for name, value in labels.items())
+
+class EndpointStats:
+    """Counters and latency histogram for one endpoint template"""
+
+    __slots__ = ('count', 'seconds', 'bytes', 'retries', 'cache_hits', 'statuses', 'buckets')
+
+    def __init__(self):
+        self.count = 0
+        self.seconds = 0.0
+        self.bytes = 0
+        self.retries = 0
+        self.cache_hits = 0
+        self.statuses: Dict[str, int] = {}
+        self.buckets = [0] * len(LATENCY_BUCKETS)
+
+class Metrics:
+    """Request and pipeline stage metrics for one run
+
+    Exported as a Prometheus text file and as a JSON run summary.
+    """
+
+    enabled = True
+
+    def __init__(self):
+        self.started = time.time()
+        self.endpoints: Dict[str, EndpointStats] = {}
+        self.stages: List[Tuple[str, float]] = []
+        self._lock = threading.Lock()
+
+    def _endpoint(self, endpoint: str) -> EndpointStats:
+        template = endpoint_template(endpoint)
+        if template not in self.endpoints:
+            self.endpoints[template] = EndpointStats()
+        return self.endpoints[template]
+
+    def observe_request(self, endpoint: str, seconds: float, status, nbytes: int = 0,
+                        retries: int = 0) -> None:
+        """Record one request sent to Yahoo, including its retries"""
+        with self._lock:
+            stats = self._endpoint(endpoint)
+            stats.count += 1
+            stats.seconds += seconds
+            stats.bytes += nbytes
+            stats.retries += retries
+            stats.statuses[str(status)] = stats.statuses.get(str(status), 0) + 1
+            for index, bound in enumerate(LATENCY_BUCKETS):
+                if seconds <= bound:
+                    stats.buckets[index] += 1
+                    break
+
+    def observe_cache_hit(self, endpoint: str) -> None:
+        """Record a request served from the response cache"""
+        with self._lock:
+            self._endpoint(endpoint).cache_hits += 1
+
+    @contextmanager
+    def span(self, stage: str):
+        """Time a pipeline stage"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            with self._lock:
+                self.stages.append((stage, time.perf_counter() - start))
+
+    def prometheus_text(self) -> str:
+        """Render every metric in the Prometheus text exposition format"""
+        lines = [
+            '# HELP yahoo_api_requests_total Requests sent to the Yahoo API by endpoint and final status',
+            '# TYPE yahoo_api_requests_total counter',
+        ]
+        for endpoint, stats in sorted(self.endpoints.items()):
+            for status, count in sorted(stats.statuses.items()):
+                lines.append(f'yahoo_api_requests_total{{{_labels(endpoint=endpoint, status=status)}}} {count}')
+
+        lines += ['# HELP yahoo_api_request_duration_seconds Request latency including retries',
+                  '# TYPE yahoo_api_request_duration_seconds histogram']
+        for endpoint, stats in sorted(self.endpoints.items()):
+            cumulative = 0
+            for bound, count in zip(LATENCY_BUCKETS, stats.buckets):
+                cumulative += count
+                lines.append(f'yahoo_api_request_duration_seconds_bucket'
+                             f'{{{_labels(endpoint=endpoint, le=bound)}}} {cumulative}')
+            lines.append(f'yahoo_api_request_duration_seconds_bucket'
+                         f'{{{_labels(endpoint=endpoint, le="+Inf")}}} {stats.count}')
+            lines.append(f'yahoo_api_request_duration_seconds_sum{{{_labels(endpoint=endpoint)}}} '
+                         f'{stats.seconds:.6f}')
+            lines.append(f'yahoo_api_request_duration_seconds_count{{{_labels(endpoint=endpoint)}}} '
+                         f'{stats.count}')
+
+        for name, attribute, help_text in (
+                ('yahoo_api_response_bytes_total', 'bytes', 'Response body bytes received'),
+                ('yahoo_api_retries_total', 'retries', 'Retried attempts'),
+                ('yahoo_api_cache_hits_total', 'cache_hits', 'Requests served from the response cache')):
+            lines += [f'# HELP {name} {help_text}', f'# TYPE {name} counter']
+            for endpoint, stats in sorted(self.endpoints.items()):
+                lines.append(f'{name}{{{_labels(endpoint=endpoint)}}} {getattr(stats, attribute)}')
+
+        lines += ['# HELP pipeline_stage_duration_seconds Wall time of each pipeline stage in the last run',
+                  '# TYPE pipeline_stage_duration_seconds gauge']
+        for stage, seconds in self.stages:
+            lines.append(f'pipeline_stage_duration_seconds{{{_labels(stage=stage)}}} {seconds:.6f}')
+        return '\n'.join(lines) + '\n'
+
+    def summary(self) -> Dict:
+        """Run summary with per-endpoint totals and stage timings"""
+        endpoints = {}
+        for endpoint, stats in sorted(self.endpoints.items()):
+            endpoints[endpoint] = {
+                'requests': stats.count,
+                'cache_hits': stats.cache_hits,
+                'seconds': round(stats.seconds, 4),
+                'mean_seconds': round(stats.seconds / stats.count, 4) if stats.count else None,
+                'bytes': stats.bytes,
+                'retries': stats.retries,
+                'statuses': dict(stats.statuses),
+            }
+        return {
+            'started': time.strftime('%Y-%m-%dT%H:%M:%S', time.localtime(self.started)),
+            'wall_seconds': round(time.time() - self.started, 4),
+            'stages': [{'stage': stage, 'seconds': round(seconds, 4)} for stage, seconds in self.stages],
+            'endpoints': endpoints,
+            'total_requests': sum(stats.count for stats in self.endpoints.values()),
+            'total_bytes': sum(stats.bytes for stats in self.endpoints.values()),
+        }
+
+    def write(self, prometheus_file: Optional[Path] = None, summary_file: Optional[Path] = None) -> None:
+        """Write the Prometheus text file and JSON summary atomically"""
+        for path, content in ((prometheus_file, self.prometheus_text),
+                              (summary_file, lambda: json.dumps(self.summary(), indent=4))):
+            if path is None:
+                continue
+            path = Path(path)
+            temp_path = path.with_name(f".{path.name}.tmp")
+            temp_path.write_text(content())
+            os.replace(temp_path, path)
+
+class NullMetrics:
+    """Metrics that record nothing, used when metrics are disabled"""
+
+    enabled = False
+
+    def observe_request(self, *args, **kwargs) -> None:
+        pass
+
+    def observe_cache_hit(self, endpoint: str) -> None:
+        pass
+
+    def span(self, stage: str):
+        return nullcontext()
+
+    def write(self, *args, **kwargs) -> None:
+        pass
+
+NULL_METRICS = NullMetrics()
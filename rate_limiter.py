@@ -0,0 +1,57 @@
+import threading
+import time
+
+class RateLimiter:
+    """Thread-safe token bucket shared by every request a run makes
+
+    The refill rate drops when Yahoo signals throttling and climbs back
+    towards the configured rate as requests succeed again.
+    """
+
+    def __init__(self, rate: float, burst: int = 1, min_rate: float = 0.1):
+        self.rate = rate
+        self.max_rate = rate
+        self.min_rate = min(min_rate, rate) if rate > 0 else 0
+        self.burst = max(1, burst)
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self) -> None:
+        """Add tokens for the time elapsed since the last refill"""
+        now = time.monotonic()
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def acquire(self) -> None:
+        """Block until a request may be sent"""
+        if self.rate <= 0:
+            return
+
+        while True:
+            with self._lock:
+                self._refill()
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+
+    def throttle(self) -> None:
+        """Halve the request rate and drain the bucket after a throttling response"""
+        if self.rate <= 0:
+            return
+
+        with self._lock:
+            self._refill()
+            self.rate = max(self.min_rate, self.rate / 2)
+            self._tokens = 0.0
+
+    def recover(self) -> None:
+        """Step the request rate back towards its configured value after a success"""
+        if self.rate <= 0 or self.rate >= self.max_rate:
+            return
+
+        with self._lock:
+            self._refill()
+            self.rate = min(self.max_rate, self.rate + self.max_rate * 0.1)
@@ -0,0 +1,153 @@
+from array import array
+from typing import Dict, Iterator, List, Optional, Tuple
+
+TIE = 'tie'
+
+def _number(value) -> float:
+    """Parse a stored points or margin value; old files store strings and 'tie'"""
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return 0.0
+
+class MatchupRecord:
+    """One matchup seen from one team's side, with numeric points and margin
+
+    Ties have a margin of 0 and 'tie' as the winning team.
+    """
+
+    __slots__ = ('team_key', 'team_name', 'week', 'team_points', 'opponent_points',
+                 'opponent_name', 'opponent_team_key', 'margin_victory', 'winning_team')
+
+    def __init__(self, team_key: str, team_name: str, week: int, team_points: float,
+                 opponent_points: float, opponent_name: str, opponent_team_key: str,
+                 margin_victory: float, winning_team: str):
+        self.team_key = team_key
+        self.team_name = team_name
+        self.week = week
+        self.team_points = team_points
+        self.opponent_points = opponent_points
+        self.opponent_name = opponent_name
+        self.opponent_team_key = opponent_team_key
+        self.margin_victory = margin_victory
+        self.winning_team = winning_team
+
+    @classmethod
+    def from_points(cls, team: Dict, week, team_points: float, opponent: Dict) -> 'MatchupRecord':
+        """Build a record from both teams' scores, working out the winner and margin"""
+        opponent_points = opponent['points']
+        if team_points > opponent_points:
+            winning_team = team['team_name']
+        elif opponent_points > team_points:
+            winning_team = opponent['name']
+        else:
+            winning_team = TIE
+        return cls(team['team_key'], team['team_name'], int(week), float(team_points),
+                   float(opponent_points), opponent['name'], opponent['team_key'],
+                   round(abs(team_points - opponent_points), 2), winning_team)
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'MatchupRecord':
+        """Read a stored matchup, including files written with string points"""
+        return cls(data['team_key'], data['team_name'], int(data['week']),
+                   _number(data['team_points']), _number(data['opponent_points']),
+                   data['opponent_name'], data['opponent_team_key'],
+                   _number(data['margin_victory']), data['winning_team'])
+
+    def to_dict(self) -> Dict:
+        return {slot: getattr(self, slot) for slot in self.__slots__}
+
+    @property
+    def is_tie(self) -> bool:
+        return self.winning_team == TIE
+
+class WeekTable:
+    """A week of matchups stored as parallel columns, one row per matchup
+
+    Teams are interned once per week and rows refer to them by index, so a
+    season of weeks costs a few small arrays instead of thousands of dicts.
+    """
+
+    __slots__ = ('week', 'team_keys', 'team_names', 'team_index', 'points',
+                 'opponent_index', 'opponent_points', 'margins', 'winner_index')
+
+    def __init__(self, week: int):
+        self.week = week
+        self.team_keys: List[str] = []
+        self.team_names: List[str] = []
+        self.team_index = array('H')
+        self.points = array('d')
+        self.opponent_index = array('H')
+        self.opponent_points = array('d')
+        self.margins = array('d')
+        self.winner_index = array('h')  # -1 for ties
+
+    def _intern(self, team_key: str, team_name: str, positions: Dict[str, int]) -> int:
+        if team_key not in positions:
+            positions[team_key] = len(self.team_keys)
+            self.team_keys.append(team_key)
+            self.team_names.append(team_name)
+        return positions[team_key]
+
+    @classmethod
+    def from_records(cls, records: List[MatchupRecord]) -> Optional['WeekTable']:
+        if not records:
+            return None
+        table = cls(records[0].week)
+        positions: Dict[str, int] = {}
+        for record in records:
+            team = table._intern(record.team_key, record.team_name, positions)
+            opponent = table._intern(record.opponent_team_key, record.opponent_name, positions)
+            table.team_index.append(team)
+            table.points.append(record.team_points)
+            table.opponent_index.append(opponent)
+            table.opponent_points.append(record.opponent_points)
+            table.margins.append(record.margin_victory)
+            if record.is_tie:
+                table.winner_index.append(-1)
+            else:
+                table.winner_index.append(team if record.winning_team == record.team_name else opponent)
+        return table
+
+    @classmethod
+    def from_rows(cls, rows: List[Dict]) -> Optional['WeekTable']:
+        """Build a table from stored matchup dicts in either the old or the numeric layout"""
+        return cls.from_records([MatchupRecord.from_dict(row) for row in rows or []])
+
+    def __len__(self) -> int:
+        return len(self.team_index)
+
+    def records(self) -> List[MatchupRecord]:
+        """Expand the table back into one record per matchup"""
+        records = []
+        for row in range(len(self)):
+            team, opponent = self.team_index[row], self.opponent_index[row]
+            winner = self.winner_index[row]
+            records.append(MatchupRecord(
+                self.team_keys[team], self.team_names[team], self.week, self.points[row],
+                self.opponent_points[row], self.team_names[opponent], self.team_keys[opponent],
+                self.margins[row], self.team_names[winner] if winner >= 0 else TIE))
+        return records
+
+    def scores(self) -> Dict[str, float]:
+        """Get every team's points keyed by team_key, in matchup order"""
+        scores = {}
+        for row in range(len(self)):
+            scores[self.team_keys[self.team_index[row]]] = self.points[row]
+            scores[self.team_keys[self.opponent_index[row]]] = self.opponent_points[row]
+        return scores
+
+    def scores_by_name(self) -> Dict[str, float]:
+        """Get every team's points keyed by team name, in matchup order"""
+        scores = {}
+        for row in range(len(self)):
+            scores[self.team_names[self.team_index[row]]] = self.points[row]
+            scores[self.team_names[self.opponent_index[row]]] = self.opponent_points[row]
+        return scores
+
+    def wins(self) -> Iterator[Tuple[str, float]]:
+        """Yield (winning team name, margin) for every matchup that was not a tie"""
+        for row in range(len(self)):
+            winner = self.winner_index[row]
+            if winner >= 0:
+                yield self.team_names[winner], self.margins[row]
@@ -0,0 +1,46 @@
+"""Fast-start league reports from stored data
+
+Prints the balance sheet and financial report from the files already in the
+data directory without loading the network stack. The Yahoo client (requests,
+OAuth) is only imported with --online, which adds playoff winnings from the
+league's final standings.
+
+    python report.py
+    python report.py --report balance --data-dir league_data/batch/449.l.12345
+"""
+from pathlib import Path
+import argparse
+
+from accounting import LeagueAccounting
+from config_manager import ConfigManager, get_default_config_path
+from storage_manager import setup_storage
+
+def main_cli() -> None:
+    parser = argparse.ArgumentParser(description='Print league reports from stored data')
+    parser.add_argument('--config', type=Path, default=get_default_config_path(),
+                        help='Path to config.yaml file')
+    parser.add_argument('--data-dir', help='Directory for stored league data (overrides storage.data_dir)')
+    parser.add_argument('--report', choices=['balance', 'financial', 'both'], default='both')
+    parser.add_argument('--online', action='store_true',
+                        help='Fetch final standings from Yahoo to include playoff winnings')
+    args = parser.parse_args()
+
+    # Stored files are enough offline; only the Yahoo lookup needs a league ID
+    config = ConfigManager(args.config, require_league=args.online)
+    yahoo_api = None
+    if args.online:
+        import main  # Imports requests and the OAuth client, only needed online
+        yahoo_api, storage = main.setup_apis(config, args.data_dir)
+    else:
+        storage = setup_storage(config, args.data_dir)
+
+    accounting = LeagueAccounting(storage, config, yahoo_api)
+    if args.report in ('financial', 'both'):
+        print(accounting.generate_financial_report())
+    if args.report == 'both':
+        print("\n" + "=" * 80)
+    if args.report in ('balance', 'both'):
+        print(accounting.generate_balance_sheet())
+
+if __name__ == "__main__":
+    main_cli()
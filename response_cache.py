@@ -0,0 +1,134 @@
+from pathlib import Path
+from typing import Any, Dict, Optional
+import hashlib
+import json
+import threading
+import time
+
+class ResponseCache:
+    """On-disk cache of Yahoo API responses with per-endpoint TTLs and LRU eviction"""
+
+    DEFAULT_TTLS = {
+        'game': 86400,
+        'teams': 86400,
+        'standings': 3600,
+        'scoreboard': 300,
+        'matchups': 300,
+        'default': 0,
+    }
+
+    def __init__(self, cache_dir: Path, max_bytes: int = 100 * 1024 * 1024,
+                 ttls: Optional[Dict[str, int]] = None):
+        self.cache_dir = Path(cache_dir)
+        self.max_bytes = max_bytes
+        self.ttls = {**self.DEFAULT_TTLS, **(ttls or {})}
+        self.index_file = self.cache_dir / 'index.json'
+        self.stats = {'hits': 0, 'misses': 0, 'stores': 0, 'evictions': 0}
+        self._lock = threading.Lock()
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self._index: Dict[str, Dict] = self._load_index()
+
+    def _load_index(self) -> Dict[str, Dict]:
+        """Load the cache index, starting fresh if it is missing or corrupt"""
+        try:
+            with self.index_file.open('r') as f:
+                return json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return {}
+
+    def _save_index(self) -> None:
+        """Write the cache index"""
+        with self.index_file.open('w') as f:
+            json.dump(self._index, f)
+
+    @staticmethod
+    def make_key(endpoint: str, params: Optional[Dict] = None) -> str:
+        """Build a stable key from an endpoint and its query parameters"""
+        query = '&'.join(f"{k}={v}" for k, v in sorted((params or {}).items()))
+        return hashlib.sha256(f"{endpoint}?{query}".encode()).hexdigest()
+
+    def _entry_path(self, key: str) -> Path:
+        return self.cache_dir / f"{key}.json"
+
+    def _remove(self, key: str) -> None:
+        """Drop an entry from the index and disk"""
+        self._index.pop(key, None)
+        self._entry_path(key).unlink(missing_ok=True)
+
+    def get(self, endpoint: str, params: Optional[Dict] = None) -> Optional[Any]:
+        """Return a cached payload if present and not expired"""
+        key = self.make_key(endpoint, params)
+        with self._lock:
+            entry = self._index.get(key)
+            if entry and entry['expires_at'] is not None and entry['expires_at'] < time.time():
+                self._remove(key)
+                entry = None
+            if not entry:
+                self.stats['misses'] += 1
+                return None
+
+            try:
+                with self._entry_path(key).open('r') as f:
+                    payload = json.load(f)
+            except (FileNotFoundError, json.JSONDecodeError):
+                self._remove(key)
+                self.stats['misses'] += 1
+                return None
+
+            entry['last_access'] = time.time()
+            self.stats['hits'] += 1
+            return payload
+
+    def contains(self, endpoint: str, params: Optional[Dict] = None) -> bool:
+        """Check for an unexpired entry without reading it or touching its access time"""
+        with self._lock:
+            entry = self._index.get(self.make_key(endpoint, params))
+        return bool(entry) and (entry['expires_at'] is None or entry['expires_at'] >= time.time())
+
+    def put(self, endpoint: str, params: Optional[Dict], payload: Any,
+            endpoint_class: str = 'default', permanent: bool = False) -> None:
+        """Store a payload; permanent entries never expire but can still be evicted for space"""
+        ttl = self.ttls.get(endpoint_class, self.ttls['default'])
+        if not permanent and ttl <= 0:
+            return
+
+        key = self.make_key(endpoint, params)
+        body = json.dumps(payload)
+        with self._lock:
+            with self._entry_path(key).open('w') as f:
+                f.write(body)
+            now = time.time()
+            self._index[key] = {
+                'endpoint': endpoint,
+                'size': len(body),
+                'expires_at': None if permanent else now + ttl,
+                'last_access': now,
+            }
+            self.stats['stores'] += 1
+            self._evict()
+            self._save_index()
+
+    def _evict(self) -> None:
+        """Evict least recently used entries until the cache fits its size cap"""
+        total = sum(entry['size'] for entry in self._index.values())
+        if total <= self.max_bytes:
+            return
+
+        for key, entry in sorted(self._index.items(), key=lambda item: item[1]['last_access']):
+            if total <= self.max_bytes:
+                break
+            total -= entry['size']
+            self._remove(key)
+            self.stats['evictions'] += 1
+
+    def flush(self) -> None:
+        """Persist access times recorded since the last store"""
+        with self._lock:
+            self._save_index()
+
+    def clear(self) -> None:
+        """Remove every cached response"""
+        with self._lock:
+            for key in list(self._index):
+                self._remove(key)
+            self._save_index()
@@ -0,0 +1,195 @@
+"""Accounting and storage benchmark over synthetic leagues of increasing size
+
+Each scenario generates a league with synthetic_league.py, then times skins,
+survivor, the season export, the financial report and the balance sheet on a
+fresh copy of the data for every repeat, plus a cold cross-season archive
+query when there are several seasons. Save a baseline once, then rerun after
+each change: stages that got slower than the baseline by more than the
+tolerance are flagged and the exit status is non-zero. Each stage is timed as
+the fastest of its repeats, the run least disturbed by the rest of the machine.
+
+    python scale_benchmark.py --save-baseline
+    python scale_benchmark.py --scenario 32x17x5
+"""
+from contextlib import redirect_stdout
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+import argparse
+import io
+import json
+import shutil
+import sys
+import tempfile
+import time
+
+import main
+from accounting import LeagueAccounting
+from benchmark import get_commit
+from config_manager import ConfigManager
+from season_archive import SeasonArchive
+from skins_engine import SkinsEngine
+from storage_manager import StorageManager
+from synthetic_league import generate_seasons
+
+# teams x weeks x seasons; small leagues finish in a few milliseconds, too close to timer noise to gate on
+DEFAULT_SCENARIOS = ['16x14x1', '32x17x1', '12x13x10', '32x17x5']
+
+def parse_scenario(value: str) -> Tuple[int, int, int]:
+    """Parse 'TEAMSxWEEKS' or 'TEAMSxWEEKSxSEASONS'"""
+    try:
+        parts = [int(part) for part in value.lower().split('x')]
+    except ValueError:
+        parts = []
+    if len(parts) not in (2, 3):
+        raise argparse.ArgumentTypeError(f"Invalid scenario '{value}', expected TEAMSxWEEKS[xSEASONS]")
+    return tuple(parts) if len(parts) == 3 else (parts[0], parts[1], 1)
+
+def scenario_name(scenario: Tuple[int, int, int]) -> str:
+    return 'x'.join(str(part) for part in scenario)
+
+def stages(data_dir: Path, config: ConfigManager, weeks: int) -> List[Tuple[str, Callable]]:
+    """The measured stages in pipeline order, bound to one season's data"""
+    storage = StorageManager(str(data_dir))
+    accounting = LeagueAccounting(storage, config, regular_season_weeks=weeks)
+    skins = SkinsEngine(storage, config.financial.skins_weekly_pot, config.game.skins_min_margin, weeks)
+    return [
+        ('skins', skins.run),
+        ('survivor', accounting.process_survivor_bonus),
+        ('export', storage.export_season_data),
+        ('financial_report', accounting.generate_financial_report),
+        ('balance_sheet', accounting.generate_balance_sheet),
+    ]
+
+def run_scenario(scenario: Tuple[int, int, int], config: ConfigManager, repeats: int,
+                 seed: int = 0) -> Dict:
+    """Time every stage of one scenario, taking the fastest of the repeats"""
+    team_count, weeks, seasons = scenario
+    timings: Dict[str, List[float]] = {}
+
+    with tempfile.TemporaryDirectory() as work_dir:
+        pristine = Path(work_dir) / 'pristine'
+        with redirect_stdout(io.StringIO()):
+            directories = generate_seasons(str(pristine), team_count, weeks, seasons, seed,
+                                           buy_in=config.financial.buy_in,
+                                           weekly_pot=config.financial.skins_weekly_pot,
+                                           min_margin=config.game.skins_min_margin)
+
+        for repeat in range(repeats):
+            # A fresh copy per repeat keeps checkpoints and read caches from warming later runs
+            run_root = Path(work_dir) / f'run_{repeat}'
+            shutil.copytree(pristine, run_root)
+            season_dir = run_root / directories[-1].name
+            named_stages = stages(season_dir, config, weeks)
+            if seasons > 1:
+                named_stages.append(('archive', lambda: SeasonArchive(str(run_root)).points_leaders()))
+            for name, func in named_stages:
+                start = time.perf_counter()
+                with redirect_stdout(io.StringIO()):
+                    func()
+                timings.setdefault(name, []).append(time.perf_counter() - start)
+            shutil.rmtree(run_root)
+
+    return {
+        'scenario': scenario_name(scenario),
+        'teams': team_count,
+        'weeks': weeks,
+        'seasons': seasons,
+        'stages': {name: round(min(values), 5) for name, values in timings.items()},
+    }
+
+def run_benchmark(scenarios: List[Tuple[int, int, int]], config_path: Path, repeats: int,
+                  backend: Optional[str] = None) -> Dict:
+    # Only the financial, game and accounting settings are used, so no league ID is needed
+    config = ConfigManager(config_path, require_league=False)
+    if backend:
+        config.accounting.backend = backend
+    return {
+        'commit': get_commit(),
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'backend': config.accounting.backend,
+        'repeats': repeats,
+        'scenarios': [run_scenario(scenario, config, repeats) for scenario in scenarios],
+    }
+
+def find_regressions(results: Dict, baseline: Dict, tolerance: float, min_delta: float) -> List[Dict]:
+    """Stages slower than the baseline by more than tolerance and by at least min_delta seconds"""
+    baseline_stages = {entry['scenario']: entry['stages'] for entry in baseline.get('scenarios', [])}
+    regressions = []
+    for entry in results['scenarios']:
+        for stage, seconds in entry['stages'].items():
+            before = baseline_stages.get(entry['scenario'], {}).get(stage)
+            if before is None:
+                continue
+            if seconds > before * (1 + tolerance) and seconds - before >= min_delta:
+                regressions.append({'scenario': entry['scenario'], 'stage': stage,
+                                    'baseline': before, 'seconds': seconds})
+    return regressions
+
+def print_results(results: Dict, baseline: Optional[Dict] = None) -> None:
+    """Print every scenario as a table, with the change against the baseline if any"""
+    baseline_stages = {entry['scenario']: entry['stages']
+                       for entry in (baseline or {}).get('scenarios', [])}
+    print(f"\n[*] Scale benchmark @ {results['commit']} ({results['backend']} backend, "
+          f"best of {results['repeats']})")
+    print("{:<12} {:<18} {:>10} {:>10} {:>8}".format("Scenario", "Stage", "Seconds", "Baseline", "Change"))
+    print("-" * 62)
+    for entry in results['scenarios']:
+        for stage, seconds in entry['stages'].items():
+            before = baseline_stages.get(entry['scenario'], {}).get(stage)
+            if before:
+                print("{:<12} {:<18} {:>10.4f} {:>10.4f} {:>+7.0%}".format(
+                    entry['scenario'], stage, seconds, before, seconds / before - 1))
+            else:
+                print("{:<12} {:<18} {:>10.4f} {:>10} {:>8}".format(entry['scenario'], stage, seconds, '-', '-'))
+
+def main_cli() -> None:
+    parser = argparse.ArgumentParser(description='Accounting and storage benchmark on synthetic leagues')
+    parser.add_argument('--scenario', type=parse_scenario, action='append',
+                        help=f"TEAMSxWEEKS[xSEASONS], repeatable (default: {', '.join(DEFAULT_SCENARIOS)})")
+    parser.add_argument('--config', type=Path, default=main.get_default_config_path(),
+                        help='Path to config.yaml file')
+    parser.add_argument('--backend', choices=['python', 'numpy'],
+                        help='Accounting backend (overrides accounting.backend)')
+    parser.add_argument('--repeats', type=int, default=7)
+    parser.add_argument('--baseline', type=Path, default=Path('scale_baseline.json'))
+    parser.add_argument('--save-baseline', action='store_true',
+                        help='Store this run as the new baseline instead of comparing against it')
+    parser.add_argument('--tolerance', type=float, default=0.25,
+                        help='Allowed slowdown against the baseline, as a fraction')
+    parser.add_argument('--min-delta', type=float, default=0.01,
+                        help='Ignore slowdowns smaller than this many seconds')
+    parser.add_argument('--output', type=Path, default=Path('scale_benchmark_results.jsonl'),
+                        help='Append results here so runs can be compared per commit')
+    args = parser.parse_args()
+
+    scenarios = args.scenario or [parse_scenario(value) for value in DEFAULT_SCENARIOS]
+    results = run_benchmark(scenarios, args.config, args.repeats, args.backend)
+    with args.output.open('a') as f:
+        f.write(json.dumps(results) + '\n')
+
+    if args.save_baseline:
+        print_results(results)
+        with args.baseline.open('w') as f:
+            json.dump(results, f, indent=4)
+        print(f"[+] Baseline saved to {args.baseline}")
+        return
+
+    baseline = None
+    if args.baseline.exists():
+        with args.baseline.open('r') as f:
+            baseline = json.load(f)
+    print_results(results, baseline)
+    if baseline is None:
+        print(f"[*] No baseline at {args.baseline}; run with --save-baseline to create one")
+        return
+
+    regressions = find_regressions(results, baseline, args.tolerance, args.min_delta)
+    for regression in regressions:
+        print(f"[!] Regression in {regression['scenario']} {regression['stage']}: "
+              f"{regression['seconds']:.4f}s vs {regression['baseline']:.4f}s baseline")
+    if regressions:
+        sys.exit(1)
+    print(f"[+] No regressions against baseline @ {baseline.get('commit', 'unknown')}")
+
+if __name__ == "__main__":
+    main_cli()
@@ -0,0 +1,184 @@
+from typing import Dict, List, Optional, Sequence, Set
+import warnings
+
+try:
+    import numpy as np
+except ImportError:  # Callers fall back to the pure Python season model
+    np = None
+
+class ScoreMatrix:
+    """Dense teams x weeks score matrix for vectorized season statistics
+
+    scores holds each team's points per week (NaN when the team has no game),
+    opponents the row index of the team it played (-1 when none) and order
+    the team's position in that week's matchups, used to break survivor ties
+    the same way the incremental engine does. Teams are ordered by first
+    appearance, so results keyed by name keep the order of a week-by-week
+    scan. Every statistic works on arrays shaped (..., teams, weeks), so
+    seasons stacked with stack() are processed in one pass.
+    """
+
+    def __init__(self, team_keys: List, team_names: List, weeks: List[int], scores,
+                 opponents, order, in_roster):
+        self.team_keys = team_keys
+        self.team_names = team_names
+        self.weeks = weeks
+        self.scores = scores
+        self.opponents = opponents
+        self.order = order
+        self.in_roster = in_roster
+
+    @classmethod
+    def from_storage(cls, storage, weeks: Sequence[int]) -> 'ScoreMatrix':
+        """Build the matrix from a storage backend's stored week tables"""
+        if np is None:
+            raise ImportError("numpy is required for the score matrix engine")
+        teams_info = storage.load_data('teams_info.json') or []
+        roster: Set[str] = {team['team_key'] for team in teams_info}
+
+        tables = [storage.load_week(week) for week in weeks]
+        rows: Dict[str, int] = {}
+        team_names: List[str] = []
+        for table in tables:
+            for key, name in zip(table.team_keys if table else [], table.team_names if table else []):
+                if key not in rows:
+                    rows[key] = len(team_names)
+                    team_names.append(name)
+        team_keys = list(rows)
+
+        shape = (len(team_keys), len(tables))
+        scores = np.full(shape, np.nan)
+        opponents = np.full(shape, -1, dtype=np.int32)
+        order = np.full(shape, np.iinfo(np.int32).max, dtype=np.int32)
+        for column, table in enumerate(tables):
+            if not table:
+                continue
+            local = np.array([rows[key] for key in table.team_keys], dtype=np.int32)
+            team = local[np.frombuffer(table.team_index, dtype=np.uint16)]
+            opponent = local[np.frombuffer(table.opponent_index, dtype=np.uint16)]
+            scores[team, column] = np.frombuffer(table.points)
+            scores[opponent, column] = np.frombuffer(table.opponent_points)
+            opponents[team, column] = opponent
+            opponents[opponent, column] = team
+            # Matchup order is team then opponent for each row, as in WeekTable.scores()
+            sides = np.empty(2 * len(table), dtype=np.int32)
+            sides[0::2], sides[1::2] = team, opponent
+            order[sides, column] = np.arange(len(sides), dtype=np.int32)
+
+        in_roster = np.array([key in roster for key in team_keys], dtype=bool)
+        return cls(team_keys, team_names, list(weeks), scores, opponents, order, in_roster)
+
+    @classmethod
+    def stack(cls, matrices: List['ScoreMatrix']) -> 'ScoreMatrix':
+        """Stack seasons into one (seasons, teams, weeks) matrix, padding missing teams and weeks"""
+        teams = max(len(matrix.team_keys) for matrix in matrices)
+        weeks = max(len(matrix.weeks) for matrix in matrices)
+        shape = (len(matrices), teams, weeks)
+        scores = np.full(shape, np.nan)
+        opponents = np.full(shape, -1, dtype=np.int32)
+        order = np.full(shape, np.iinfo(np.int32).max, dtype=np.int32)
+        in_roster = np.zeros(shape[:2], dtype=bool)
+        for season, matrix in enumerate(matrices):
+            team_count, week_count = matrix.scores.shape
+            scores[season, :team_count, :week_count] = matrix.scores
+            opponents[season, :team_count, :week_count] = matrix.opponents
+            order[season, :team_count, :week_count] = matrix.order
+            in_roster[season, :team_count] = matrix.in_roster
+        return cls([matrix.team_keys for matrix in matrices], [matrix.team_names for matrix in matrices],
+                   list(range(1, weeks + 1)), scores, opponents, order, in_roster)
+
+    @property
+    def played(self):
+        return ~np.isnan(self.scores)
+
+    def totals(self):
+        """Total points per team over all weeks"""
+        return np.nansum(self.scores, axis=-1)
+
+    def total_points(self) -> Dict[str, float]:
+        """Total points keyed by team name, for a single season"""
+        return {name: float(total) for name, total in zip(self.team_names, self.totals())}
+
+    def margins(self):
+        """Each team's margin over its opponent per week; NaN without a game"""
+        opponent_scores = np.take_along_axis(self.scores, np.maximum(self.opponents, 0), axis=-2)
+        return np.where(self.opponents >= 0, np.round(self.scores - opponent_scores, 2), np.nan)
+
+    def skins_candidates(self, min_margin: float):
+        """Winning team row and margin per week among margins of at least min_margin
+
+        Rows are -1 for weeks nobody won by enough.
+        """
+        margins = self.margins()
+        eligible = np.where(margins >= min_margin, margins, -np.inf)
+        winners = np.argmax(eligible, axis=-2)
+        best = np.max(eligible, axis=-2)
+        return np.where(np.isfinite(best), winners, -1), np.where(np.isfinite(best), best, np.nan)
+
+    def weekly_low_high(self):
+        """Lowest and highest score of every week, NaN for weeks without games"""
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore', RuntimeWarning)  # All-NaN weeks
+            return np.nanmin(self.scores, axis=-2), np.nanmax(self.scores, axis=-2)
+
+    def weekly_medians(self):
+        """Median score of every week, NaN for weeks without games"""
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore', RuntimeWarning)  # All-NaN weeks
+            return np.nanmedian(self.scores, axis=-2)
+
+    def all_play_records(self):
+        """Wins, losses and ties per team had it played every other team every week"""
+        mine = self.scores[..., :, None, :]
+        theirs = self.scores[..., None, :, :]
+        both = ~np.isnan(mine) & ~np.isnan(theirs)
+        wins = np.sum(both & (mine > theirs), axis=(-2, -1))
+        losses = np.sum(both & (mine < theirs), axis=(-2, -1))
+        # A team always ties itself, so drop those from the tie count
+        ties = np.sum(both & (mine == theirs), axis=(-2, -1)) - np.sum(self.played, axis=-1)
+        return wins, losses, ties
+
+    def eliminations(self):
+        """Row of the team eliminated each week by the survivor rules, -1 for none
+
+        Each week the lowest scoring roster team still alive is eliminated
+        until one remains. Only the week loop is sequential; every stacked
+        season advances together.
+        """
+        alive = self.in_roster.copy()
+        eliminated = np.full(self.scores.shape[:-2] + self.scores.shape[-1:], -1, dtype=np.int32)
+        max_order = np.iinfo(np.int32).max
+        played = self.played
+        for column in range(self.scores.shape[-1]):
+            week_scores = np.where(alive & played[..., column], self.scores[..., column], np.inf)
+            lowest = np.min(week_scores, axis=-1, keepdims=True)
+            active = (np.sum(alive, axis=-1) > 1) & np.isfinite(lowest[..., 0])
+            # Among tied lowest scores the team listed first in the week's matchups goes
+            tie_order = np.where(week_scores == lowest, self.order[..., column], max_order)
+            rows = np.argmin(tie_order, axis=-1)
+            eliminated[..., column] = np.where(active, rows, -1)
+            np.put_along_axis(alive, rows[..., None], ~active[..., None] & np.take_along_axis(
+                alive, rows[..., None], axis=-1), axis=-1)
+        return eliminated
+
+    def elimination_list(self, roster: Optional[Dict[str, str]] = None) -> List[Dict]:
+        """Survivor eliminations for a single season in the incremental engine's format"""
+        roster = roster or {}
+        eliminations = []
+        for column, row in enumerate(self.eliminations()):
+            if row >= 0:
+                key = self.team_keys[row]
+                eliminations.append({'week': self.weeks[column], 'team_key': key,
+                                     'team_name': roster.get(key, self.team_names[row]),
+                                     'points': float(self.scores[row, column])})
+        return eliminations
+
+def available() -> bool:
+    """Whether the NumPy engine can be used"""
+    return np is not None
+
+def survivor_winner(matrix: ScoreMatrix, roster: Dict[str, str]) -> Optional[str]:
+    """Name of the last roster team standing after a season's eliminations"""
+    eliminated = {matrix.team_keys[row] for row in matrix.eliminations() if row >= 0}
+    remaining = [key for key in roster if key not in eliminated]
+    return roster[remaining[0]] if len(remaining) == 1 and eliminated else None
@@ -0,0 +1,274 @@
+"""Cross-season analytics over archived season exports
+
+Every season_YYYY.json export under a root directory, including batch runner
+namespaces, is indexed once: the byte range of each week's line is recorded
+so single weeks are parsed straight out of a memory map. Per-season results
+are cached by file hash in season_archive_cache.json, so unchanged exports
+are never reread.
+
+    python season_archive.py --root league_data --query leaders
+"""
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+import argparse
+import hashlib
+import json
+import mmap
+import os
+import re
+
+import serializers
+from records import WeekTable
+from season_model import REGULAR_SEASON_WEEKS
+from storage_manager import SEASON_WEEKS_OPEN
+from survivor_engine import replay_eliminations
+
+CACHE_FILE = 'season_archive_cache.json'
+WEEK_KEY = re.compile(rb'^"(\d+)":')
+# Season exports only; leaves out this module's cache, temp files and backup copies
+SEASON_EXPORT = re.compile(r'season_\d{4}\.json(\.gz|\.zst)?')
+
+class SeasonFile:
+    """One archived season export, read lazily week by week"""
+
+    def __init__(self, path: Path, digest: str, index: Optional[Dict[str, List[int]]] = None):
+        self.path = path
+        self.digest = digest
+        self._index = index
+        self._header: Optional[Dict] = None
+        # Compressed and pre-streaming exports can't be sliced and are read sequentially
+        with path.open('rb') as f:
+            self.seekable = f.readline().rstrip().endswith(SEASON_WEEKS_OPEN)
+
+    def _map(self) -> mmap.mmap:
+        with self.path.open('rb') as f:
+            return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+    @property
+    def index(self) -> Dict[str, List[int]]:
+        """Byte range of every week line, found by scanning for newlines without parsing"""
+        if self._index is None:
+            self._index = {}
+            if self.seekable:
+                with self._map() as data:
+                    start = data.find(b'\n') + 1
+                    while 0 < start < len(data):
+                        end = data.find(b'\n', start)
+                        end = len(data) if end == -1 else end
+                        match = WEEK_KEY.match(data[start:start + 16])
+                        if match:
+                            self._index[match.group(1).decode()] = [start, end]
+                        start = end + 1
+            else:
+                self._index = {week: [] for week, _ in self._iter_sequential()}
+        return self._index
+
+    def header(self) -> Dict:
+        """Teams, skins and timestamp of the season, parsed from the first line only"""
+        if self._header is None:
+            with serializers.open_reader(self.path) as f:
+                line = f.readline().rstrip()
+                if line.endswith(SEASON_WEEKS_OPEN):
+                    self._header = serializers.loads_json(line[:-len(SEASON_WEEKS_OPEN)].rstrip(b',') + b'}')
+                else:
+                    self._header = serializers.loads_json(line + f.read())
+                    self._header.pop('weeks', None)
+        return self._header
+
+    def _iter_sequential(self) -> Iterator[Tuple[str, Any]]:
+        with serializers.open_reader(self.path) as f:
+            line = f.readline().rstrip()
+            if not line.endswith(SEASON_WEEKS_OPEN):
+                yield from serializers.loads_json(line + f.read()).get('weeks', {}).items()
+                return
+            for line in f:
+                line = line.rstrip().rstrip(b',')
+                if line == b'}}':
+                    break
+                yield from serializers.loads_json(b'{' + line + b'}').items()
+
+    def week(self, week: str) -> Optional[List[Dict]]:
+        """Parse a single week"""
+        if not self.seekable:
+            return next((rows for number, rows in self._iter_sequential() if number == week), None)
+        if week not in self.index:
+            return None
+        start, end = self.index[week]
+        with self._map() as data:
+            line = data[start:end].rstrip().rstrip(b',')
+        return serializers.loads_json(b'{' + line + b'}')[week]
+
+    def iter_weeks(self) -> Iterator[Tuple[str, List[Dict]]]:
+        """Yield (week, matchups) in week order, parsing one week at a time"""
+        if not self.seekable:
+            yield from sorted(self._iter_sequential(), key=lambda item: int(item[0]))
+            return
+        for week in sorted(self.index, key=int):
+            yield week, self.week(week)
+
+    def summarize(self, regular_season_weeks: int = REGULAR_SEASON_WEEKS) -> Dict:
+        """Per-season totals by owner, skins winnings and survivor results"""
+        header = self.header()
+        teams = header.get('teams') or []
+        roster = {team['team_key']: team['team_name'] for team in teams}
+        owners = {team['team_name']: team.get('manager') or team['team_name'] for team in teams}
+        seasons = {team.get('season') for team in teams if team.get('season')}
+
+        points: Dict[str, float] = {}
+        survivor_weeks = []
+        for week, rows in self.iter_weeks():
+            if int(week) > regular_season_weeks:
+                continue
+            table = WeekTable.from_rows(rows)
+            if not table:
+                continue
+            for name, score in table.scores_by_name().items():
+                owner = owners.get(name, name)
+                points[owner] = points.get(owner, 0.0) + score
+            survivor_weeks.append((table.week, table.scores()))
+
+        skins: Dict[str, float] = {}
+        for team, wins in (header.get('skins') or {}).items():
+            if isinstance(wins, list):
+                owner = owners.get(team, team)
+                skins[owner] = skins.get(owner, 0.0) + sum(float(win['pot_winnings']) for win in wins)
+
+        eliminations = replay_eliminations(roster, survivor_weeks)
+        remaining = [key for key in roster if key not in {e['team_key'] for e in eliminations}]
+        winner = roster[remaining[0]] if len(remaining) == 1 and eliminations else None
+        return {
+            'season': seasons.pop() if len(seasons) == 1 else self.path.stem.split('_')[-1],
+            'points': points,
+            'skins': skins,
+            'survivor': {
+                'winner': owners.get(winner, winner) if winner else None,
+                'eliminations': [{'week': e['week'], 'owner': owners.get(e['team_name'], e['team_name']),
+                                  'points': e['points']} for e in eliminations]
+            }
+        }
+
+class SeasonArchive:
+    """Index of every season export under a root directory"""
+
+    def __init__(self, root: str = 'league_data'):
+        self.root = Path(root)
+        self.cache_path = self.root / CACHE_FILE
+        self._cache = self._load_cache()
+        self._dirty = False
+        self.seasons = self._scan()
+
+    def _load_cache(self) -> Dict:
+        try:
+            with self.cache_path.open('r') as f:
+                cache = json.load(f)
+            return {'files': cache.get('files', {}), 'seasons': cache.get('seasons', {})}
+        except (FileNotFoundError, json.JSONDecodeError):
+            return {'files': {}, 'seasons': {}}
+
+    def save(self) -> None:
+        """Persist file hashes, week indexes and per-season results"""
+        if not self._dirty:
+            return
+        self.root.mkdir(parents=True, exist_ok=True)
+        temp_path = self.cache_path.with_suffix('.tmp')
+        with temp_path.open('w') as f:
+            json.dump(self._cache, f)
+        os.replace(temp_path, self.cache_path)
+        self._dirty = False
+
+    def _digest(self, path: Path) -> str:
+        """Hash a file, reusing the stored hash while its (mtime, size) is unchanged"""
+        stat = path.stat()
+        signature = [stat.st_mtime_ns, stat.st_size]
+        key = str(path)
+        entry = self._cache['files'].get(key)
+        if entry and entry['signature'] == signature:
+            return entry['hash']
+
+        digest = hashlib.sha256()
+        with path.open('rb') as f:
+            for block in iter(lambda: f.read(1 << 20), b''):
+                digest.update(block)
+        self._cache['files'][key] = {'signature': signature, 'hash': digest.hexdigest()}
+        self._dirty = True
+        return digest.hexdigest()
+
+    def _scan(self) -> List[SeasonFile]:
+        seasons = []
+        for path in sorted(self.root.rglob('season_*')):
+            if not SEASON_EXPORT.fullmatch(path.name) or 'backups' in path.relative_to(self.root).parts:
+                continue
+            if not path.is_file() or path.stat().st_size == 0:
+                continue
+            digest = self._digest(path)
+            index = self._cache['seasons'].get(digest, {}).get('index')
+            seasons.append(SeasonFile(path, digest, index))
+        return seasons
+
+    def summary(self, season: SeasonFile) -> Dict:
+        """Get a season's summary, computed once per file content"""
+        entry = self._cache['seasons'].setdefault(season.digest, {})
+        if 'summary' not in entry:
+            entry['summary'] = season.summarize()
+            entry['index'] = season.index
+            self._dirty = True
+        return entry['summary']
+
+    def summaries(self) -> List[Dict]:
+        summaries = [self.summary(season) for season in self.seasons]
+        self.save()
+        return summaries
+
+    def points_leaders(self, limit: Optional[int] = None) -> List[Dict]:
+        """All-time regular season points by owner, highest first"""
+        totals: Dict[str, Dict] = {}
+        for summary in self.summaries():
+            for owner, points in summary['points'].items():
+                entry = totals.setdefault(owner, {'owner': owner, 'points': 0.0, 'seasons': 0})
+                entry['points'] += points
+                entry['seasons'] += 1
+        leaders = sorted(totals.values(), key=lambda entry: entry['points'], reverse=True)
+        return leaders[:limit] if limit else leaders
+
+    def skins_totals(self) -> Dict[str, float]:
+        """All-time skins winnings by owner, highest first"""
+        totals: Dict[str, float] = {}
+        for summary in self.summaries():
+            for owner, amount in summary['skins'].items():
+                totals[owner] = totals.get(owner, 0.0) + amount
+        return dict(sorted(totals.items(), key=lambda item: item[1], reverse=True))
+
+    def survivor_history(self) -> List[Dict]:
+        """Survivor winner and elimination order of every season"""
+        # The league comes from the file's directory, since identical exports share a cached summary
+        return [{'season': summary['season'], 'league': season.path.parent.name, **summary['survivor']}
+                for season, summary in zip(self.seasons, self.summaries())]
+
+def main_cli() -> None:
+    parser = argparse.ArgumentParser(description='Cross-season analytics over season exports')
+    parser.add_argument('--root', default='league_data',
+                        help='Directory searched recursively for season_*.json exports')
+    parser.add_argument('--query', choices=['leaders', 'skins', 'survivor'], default='leaders')
+    parser.add_argument('--limit', type=int, default=10)
+    args = parser.parse_args()
+
+    archive = SeasonArchive(args.root)
+    print(f"[*] {len(archive.seasons)} season exports under {archive.root}")
+    if args.query == 'leaders':
+        print("\n{:<25} {:>12} {:>8}".format("Owner", "Points", "Seasons"))
+        print("-" * 47)
+        for entry in archive.points_leaders(args.limit):
+            print("{:<25} {:>12.2f} {:>8}".format(entry['owner'], entry['points'], entry['seasons']))
+    elif args.query == 'skins':
+        print("\n{:<25} {:>12}".format("Owner", "Skins"))
+        print("-" * 38)
+        for owner, amount in list(archive.skins_totals().items())[:args.limit]:
+            print("{:<25} {:>12.2f}".format(owner, amount))
+    else:
+        for season in archive.survivor_history():
+            print(f"\n[*] {season['season']} ({season['league']}): winner {season['winner'] or '-'}")
+            for elimination in season['eliminations']:
+                print(f"    Week {elimination['week']}: {elimination['owner']} ({elimination['points']})")
+
+if __name__ == "__main__":
+    main_cli()
@@ -0,0 +1,80 @@
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Set
+from decimal import Decimal
+from survivor_engine import SurvivorEngine
+
+REGULAR_SEASON_WEEKS = 13
+
+def season_files(regular_season_weeks: int = REGULAR_SEASON_WEEKS) -> List[str]:
+    """Files a SeasonModel is derived from"""
+    return (['teams_info.json', 'skins_winners.json'] +
+            [f'week_{week}_matchup.json' for week in range(1, regular_season_weeks + 1)])
+
+@dataclass
+class SeasonModel:
+    """Season aggregates for the league reports, built in one pass over the stored weeks"""
+    roster: Dict[str, str] = field(default_factory=dict)  # team_key -> team_name
+    team_names: Set[str] = field(default_factory=set)  # every team seen in a matchup
+    total_points: Dict[str, float] = field(default_factory=dict)  # by team name
+    survivor_eliminations: List[Dict] = field(default_factory=list)
+    survivor_winner: Optional[str] = None
+    skins_wins: Dict[str, List[Dict]] = field(default_factory=dict)
+    skins_totals: Dict[str, Decimal] = field(default_factory=dict)
+
+    @classmethod
+    def build(cls, storage, regular_season_weeks: int = REGULAR_SEASON_WEEKS,
+              backend: str = 'python') -> 'SeasonModel':
+        """Read every regular season week once and derive all report inputs from it
+
+        backend 'numpy' computes totals and survivor results with ScoreMatrix.
+        """
+        model = cls()
+        teams_info = storage.load_data('teams_info.json') or []
+        model.roster = {team['team_key']: team['team_name'] for team in teams_info}
+
+        if backend == 'numpy':
+            from score_matrix import ScoreMatrix, survivor_winner  # Loads numpy
+            # Vectorized totals and survivor replay over a teams x weeks matrix
+            matrix = ScoreMatrix.from_storage(storage, range(1, regular_season_weeks + 1))
+            model.team_names = set(matrix.team_names)
+            model.total_points = matrix.total_points()
+            model.survivor_eliminations = matrix.elimination_list(model.roster)
+            model.survivor_winner = survivor_winner(matrix, model.roster)
+        else:
+            for week in range(1, regular_season_weeks + 1):
+                week_table = storage.load_week(week)
+                if not week_table:
+                    continue
+
+                for team_name, points in week_table.scores_by_name().items():
+                    model.team_names.add(team_name)
+                    model.total_points[team_name] = model.total_points.get(team_name, 0.0) + points
+
+            # Survivor standings resume from the engine state; only process_survivor_bonus saves it
+            standings = SurvivorEngine(storage, regular_season_weeks).current()
+            model.survivor_eliminations = standings['eliminations']
+            model.survivor_winner = standings['winner']
+
+            if hasattr(storage, 'get_total_points'):
+                # Let the database do the aggregation when the backend supports it
+                model.total_points = storage.get_total_points(1, regular_season_weeks)
+
+        skins_data = storage.load_data('skins_winners.json') or {}
+        for team, wins in skins_data.items():
+            # Skip malformed entries
+            if not isinstance(wins, list):
+                continue
+            model.skins_wins[team] = list(wins)
+            model.skins_totals[team] = sum(Decimal(str(win['pot_winnings'])) for win in wins)
+
+        if hasattr(storage, 'get_skins_totals'):
+            model.skins_totals = storage.get_skins_totals()
+
+        return model
+
+    @property
+    def highest_points(self) -> Optional[tuple]:
+        """Team name and total of the highest scoring team"""
+        if not self.total_points:
+            return None
+        return max(self.total_points.items(), key=lambda x: x[1])
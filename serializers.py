@@ -0,0 +1,134 @@
+from pathlib import Path
+from typing import Any, BinaryIO, Optional, Tuple
+import gzip
+import io
+import json
+
+try:
+    import orjson
+except ImportError:  # The standard library encoder is used instead
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:  # msgpack formats fall back to compact JSON
+    msgpack = None
+
+try:
+    import zstandard
+except ImportError:  # zstd compression falls back to gzip
+    zstandard = None
+
+ENCODINGS = ('json', 'json-pretty', 'msgpack')
+COMPRESSIONS = ('gzip', 'zstd')
+
+# Files are grouped into classes that can each be given their own format
+FILE_CLASSES = ('week', 'state', 'season', 'default')
+DEFAULT_FORMATS = {'default': 'json'}
+
+GZIP_MAGIC = b'\x1f\x8b'
+ZSTD_MAGIC = b'\x28\xb5\x2f\xfd'
+
+def file_class(filename: str) -> str:
+    """Get the format class of a stored file from its name"""
+    if filename.startswith('week_'):
+        return 'week'
+    if filename.startswith('season_'):
+        return 'season'
+    if filename.endswith('_state.json'):
+        return 'state'
+    return 'default'
+
+def parse_format(spec: str) -> Tuple[str, Optional[str]]:
+    """Split a format such as 'msgpack+zstd' into its encoding and compression"""
+    encoding, _, compression = spec.partition('+')
+    if encoding not in ENCODINGS:
+        raise ValueError(f"Unknown storage encoding '{encoding}', expected one of {ENCODINGS}")
+    if compression and compression not in COMPRESSIONS:
+        raise ValueError(f"Unknown storage compression '{compression}', expected one of {COMPRESSIONS}")
+    return encoding, compression or None
+
+def dumps_json(data: Any, pretty: bool = False) -> bytes:
+    """Encode JSON with orjson when installed; values JSON can't hold become strings"""
+    if orjson is not None:
+        option = orjson.OPT_NON_STR_KEYS | (orjson.OPT_INDENT_2 if pretty else 0)
+        return orjson.dumps(data, default=str, option=option)
+    if pretty:
+        return json.dumps(data, indent=4, default=str).encode()
+    return json.dumps(data, separators=(',', ':'), default=str).encode()
+
+def loads_json(content: bytes) -> Any:
+    return orjson.loads(content) if orjson is not None else json.loads(content)
+
+def compress(content: bytes, compression: Optional[str]) -> bytes:
+    if compression == 'zstd':
+        return zstandard.ZstdCompressor().compress(content)
+    if compression == 'gzip':
+        return gzip.compress(content)
+    return content
+
+def decompress(content: bytes) -> bytes:
+    """Undo whatever compression the content was written with, detected by magic bytes"""
+    try:
+        if content.startswith(ZSTD_MAGIC):
+            if zstandard is None:
+                raise ValueError("File is zstd compressed but zstandard is not installed")
+            return zstandard.ZstdDecompressor().decompressobj().decompress(content)
+        if content.startswith(GZIP_MAGIC):
+            return gzip.decompress(content)
+    except (OSError, EOFError) as e:
+        raise ValueError(f"Corrupt compressed data: {e}") from e
+    return content
+
+def loads(content: bytes) -> Any:
+    """Decode stored content in any supported format
+
+    JSON always starts with whitespace, '{' or '[' while msgpack maps and
+    arrays never do, so files written with older settings stay readable.
+    """
+    content = decompress(content)
+    if content[:1] in b'{[ \t\r\n"' or not content:
+        return loads_json(content)
+    if msgpack is None:
+        raise ValueError("File is msgpack encoded but msgpack is not installed")
+    return msgpack.unpackb(content, raw=False, strict_map_key=False)
+
+class Serializer:
+    """Encoder for one storage format such as 'json', 'json-pretty' or 'msgpack+zstd'"""
+
+    def __init__(self, spec: str = 'json'):
+        self.encoding, self.compression = parse_format(spec)
+        if self.encoding == 'msgpack' and msgpack is None:
+            print(f"[!] msgpack is not installed, storing '{spec}' files as JSON")
+            self.encoding = 'json'
+        if self.compression == 'zstd' and zstandard is None:
+            print(f"[!] zstandard is not installed, compressing '{spec}' files with gzip")
+            self.compression = 'gzip'
+
+    def dumps(self, data: Any) -> bytes:
+        if self.encoding == 'msgpack':
+            content = msgpack.packb(data, default=str, use_bin_type=True)
+        else:
+            content = dumps_json(data, pretty=self.encoding == 'json-pretty')
+        return compress(content, self.compression)
+
+    def open_writer(self, path: Path) -> BinaryIO:
+        """Open a binary stream that compresses with this format's compression"""
+        if self.compression == 'zstd':
+            return zstandard.ZstdCompressor().stream_writer(path.open('wb'))
+        if self.compression == 'gzip':
+            return gzip.open(path, 'wb')
+        return path.open('wb')
+
+def open_reader(path: Path) -> BinaryIO:
+    """Open a stored file for streaming reads, decompressing it if needed"""
+    with path.open('rb') as f:
+        magic = f.read(len(ZSTD_MAGIC))
+    if magic.startswith(ZSTD_MAGIC):
+        if zstandard is None:
+            raise ValueError(f"{path.name} is zstd compressed but zstandard is not installed")
+        # Buffered so callers can iterate the stream line by line
+        return io.BufferedReader(zstandard.ZstdDecompressor().stream_reader(path.open('rb')))
+    if magic.startswith(GZIP_MAGIC):
+        return gzip.open(path, 'rb')
+    return path.open('rb')
@@ -0,0 +1,103 @@
+from typing import Dict, List, Optional
+from decimal import Decimal
+from records import WeekTable
+
+class SkinsEngine:
+    """Rolling-pot skins game that resumes from a saved checkpoint
+
+    The checkpoint records, for every week, the fingerprint of the week file it
+    was computed from, the week's winner and the pot carried out of it. A run
+    replays only from the first week whose file is new or changed.
+    """
+
+    STATE_FILE = 'skins_state.json'
+    RESULTS_FILE = 'skins_winners.json'
+
+    def __init__(self, storage, weekly_pot: Decimal, min_margin: float, total_weeks: int = 17):
+        self.storage = storage
+        self.weekly_pot = Decimal(str(weekly_pot))
+        self.min_margin = min_margin
+        self.total_weeks = total_weeks
+
+    def _settings(self) -> Dict:
+        return {'weekly_pot': str(self.weekly_pot), 'min_margin': self.min_margin}
+
+    def _load_state(self) -> List[Dict]:
+        """Load checkpointed week entries, discarding them if the game rules changed"""
+        state = self.storage.load_data(self.STATE_FILE, mutable=True)
+        if not state or state.get('settings') != self._settings():
+            return []
+        return state.get('weeks', [])
+
+    def _week_signature(self, week: int) -> Optional[list]:
+        signature = self.storage.file_signature(f'week_{week}_matchup.json')
+        return list(signature) if signature is not None else None
+
+    def find_week_winner(self, week_table: WeekTable) -> Optional[Dict]:
+        """Get the team with the largest qualifying margin in a week"""
+        potential_winners = {}
+        for winning_team, margin in week_table.wins():  # Ties are never yielded
+            margin = Decimal(str(margin))
+            if margin >= self.min_margin:
+                if winning_team not in potential_winners or margin > potential_winners[winning_team]:
+                    potential_winners[winning_team] = margin
+
+        if not potential_winners:
+            return None
+        team, margin = max(potential_winners.items(), key=lambda x: x[1])
+        return {'team': team, 'margin': margin}
+
+    def run(self) -> Dict[str, List[Dict]]:
+        """Bring skins results up to date and return them keyed by team"""
+        entries = self._load_state()
+        signatures = [self._week_signature(week) for week in range(1, self.total_weeks + 1)]
+
+        # Replay from the first week that is new or whose file changed
+        start = 0
+        while start < min(len(entries), self.total_weeks) and entries[start]['signature'] == signatures[start]:
+            start += 1
+        if start == self.total_weeks and len(entries) == self.total_weeks:
+            print(f"[*] Skins up to date, all {self.total_weeks} weeks reused from checkpoint")
+            return self.storage.load_data(self.RESULTS_FILE) or {}
+
+        entries = entries[:start]
+        current_pot = Decimal(entries[-1]['pot_after']) if entries else self.weekly_pot
+        if start:
+            print(f"[*] Skins weeks 1-{start} reused from checkpoint")
+
+        for week in range(start + 1, self.total_weeks + 1):
+            entry = {'week': week, 'signature': signatures[week - 1], 'winner': None}
+            week_table = self.storage.load_week(week)
+            if week_table:
+                winner = self.find_week_winner(week_table)
+                if not winner:
+                    # No winner this week, pot increases
+                    current_pot += self.weekly_pot
+                else:
+                    entry['winner'] = winner['team']
+                    entry['margin_victory'] = float(winner['margin'])
+                    entry['pot_winnings'] = float(current_pot)
+                    print(f"[*] Skins winner for week {week}: {winner['team']} "
+                          f"by {round(float(winner['margin']), 2)}")
+                    # Reset pot for next week
+                    current_pot = self.weekly_pot
+            entry['pot_after'] = str(current_pot)
+            entries.append(entry)
+
+        skins_winners = self.winners_from_entries(entries)
+        self.storage.save_data(self.RESULTS_FILE, skins_winners)
+        self.storage.save_data(self.STATE_FILE, {'settings': self._settings(), 'weeks': entries})
+        return skins_winners
+
+    @staticmethod
+    def winners_from_entries(entries: List[Dict]) -> Dict[str, List[Dict]]:
+        """Group weekly winners by team in the order teams first won"""
+        skins_winners: Dict[str, List[Dict]] = {}
+        for entry in entries:
+            if entry['winner']:
+                skins_winners.setdefault(entry['winner'], []).append({
+                    'week_number': entry['week'],
+                    'margin_victory': entry['margin_victory'],
+                    'pot_winnings': entry['pot_winnings']
+                })
+        return skins_winners
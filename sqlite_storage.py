@@ -0,0 +1,233 @@
+from typing import Any, Dict, List, Optional, Tuple
+from decimal import Decimal
+from datetime import datetime
+from contextlib import contextmanager
+import json
+import re
+import sqlite3
+import threading
+from storage_manager import StorageManager
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS documents (
+    filename TEXT PRIMARY KEY,
+    data TEXT NOT NULL,
+    updated_at TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS teams (
+    team_key TEXT PRIMARY KEY,
+    team_id TEXT,
+    team_name TEXT NOT NULL,
+    manager TEXT,
+    season TEXT
+);
+CREATE TABLE IF NOT EXISTS matchups (
+    week INTEGER NOT NULL,
+    team_key TEXT NOT NULL,
+    team_name TEXT NOT NULL,
+    points REAL NOT NULL,
+    opponent_key TEXT,
+    opponent_name TEXT,
+    opponent_points REAL NOT NULL,
+    margin REAL NOT NULL,
+    winning_team TEXT,
+    PRIMARY KEY (week, team_key)
+);
+CREATE INDEX IF NOT EXISTS idx_matchups_team ON matchups (team_key, week);
+CREATE INDEX IF NOT EXISTS idx_matchups_name ON matchups (team_name, week);
+CREATE TABLE IF NOT EXISTS skins (
+    week INTEGER PRIMARY KEY,
+    team_name TEXT NOT NULL,
+    margin REAL NOT NULL,
+    pot_winnings REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_skins_team ON skins (team_name);
+CREATE TABLE IF NOT EXISTS survivor (
+    id INTEGER PRIMARY KEY CHECK (id = 1),
+    winner TEXT,
+    bonus REAL
+);
+CREATE TABLE IF NOT EXISTS payments (
+    team_name TEXT PRIMARY KEY,
+    amount TEXT NOT NULL
+);
+"""
+
+WEEK_FILE_PATTERN = re.compile(r'^week_(\d+)_matchup\.json$')
+
+class SQLiteStorageManager(StorageManager):
+    """StorageManager backed by a single SQLite database with indexed league tables
+
+    Every document is kept verbatim so save_data/load_data behave exactly like
+    the JSON backend, and known files are also normalized into tables that the
+    query methods aggregate in SQL.
+    """
+
+    def __init__(self, base_dir: str = "league_data", db_name: str = "league.db",
+                 formats: Optional[Dict[str, str]] = None):
+        # Formats only apply to files written outside the database, like the season export
+        super().__init__(base_dir, formats=formats)
+        self.db_path = self.base_dir / db_name
+        self._lock = threading.RLock()
+        self.conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        self.conn.executescript(SCHEMA)
+
+    def close(self) -> None:
+        """Close the database connection"""
+        self.conn.close()
+
+    def save_data(self, filename: str, data: Any) -> None:
+        """Save a document and refresh its normalized rows"""
+        with self._lock:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO documents (filename, data, updated_at) VALUES (?, ?, ?)",
+                (filename, json.dumps(data, default=str), datetime.now().isoformat())
+            )
+            self._normalize(filename, data)
+            if not self._tx_depth:
+                self.conn.commit()
+
+    @contextmanager
+    def transaction(self):
+        """Group every save_data call into one database transaction"""
+        with self._lock:
+            self._tx_depth += 1
+        try:
+            yield self
+        except BaseException:
+            with self._lock:
+                self._tx_depth -= 1
+                if self._tx_depth == 0:
+                    self.conn.rollback()
+            raise
+
+        with self._lock:
+            self._tx_depth -= 1
+            if self._tx_depth == 0:
+                self.conn.commit()
+
+    def load_data(self, filename: str, mutable: bool = False) -> Optional[Any]:
+        """Load a document saved with save_data; every call returns a fresh copy"""
+        with self._lock:
+            row = self.conn.execute(
+                "SELECT data FROM documents WHERE filename = ?", (filename,)
+            ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def file_signature(self, filename: str) -> Optional[tuple]:
+        """Get the last update time of a stored document, None if missing"""
+        with self._lock:
+            row = self.conn.execute(
+                "SELECT updated_at FROM documents WHERE filename = ?", (filename,)
+            ).fetchone()
+        return (row[0],) if row else None
+
+    def list_weeks_data(self) -> list[str]:
+        """List all available week data documents"""
+        with self._lock:
+            rows = self.conn.execute(
+                "SELECT filename FROM documents WHERE filename LIKE 'week_%.json'"
+            ).fetchall()
+        return sorted(row[0] for row in rows)
+
+    def _normalize(self, filename: str, data: Any) -> None:
+        """Rewrite the table rows derived from a known document"""
+        week_match = WEEK_FILE_PATTERN.match(filename)
+        if week_match:
+            self._save_week(int(week_match.group(1)), data or [])
+        elif filename == 'teams_info.json':
+            self._save_teams(data or [])
+        elif filename == 'skins_winners.json':
+            self._save_skins(data or {})
+        elif filename == 'survivor.json':
+            self.conn.execute("DELETE FROM survivor")
+            if data:
+                self.conn.execute("INSERT INTO survivor (id, winner, bonus) VALUES (1, ?, ?)",
+                                  (data.get('winner'), data.get('bonus')))
+        elif filename == 'payments.json':
+            self.conn.execute("DELETE FROM payments")
+            self.conn.executemany("INSERT INTO payments (team_name, amount) VALUES (?, ?)",
+                                  [(team, str(amount)) for team, amount in (data or {}).items()])
+
+    @staticmethod
+    def _margin(value: Any) -> float:
+        """Convert a stored margin, which is 'tie' for tied games"""
+        try:
+            return float(value)
+        except (TypeError, ValueError):
+            return 0.0
+
+    def _save_week(self, week: int, matchups: List[Dict]) -> None:
+        """Store each matchup once from each team's side"""
+        self.conn.execute("DELETE FROM matchups WHERE week = ?", (week,))
+        rows = []
+        for matchup in matchups:
+            points = float(matchup['team_points'])
+            opponent_points = float(matchup['opponent_points'])
+            margin = self._margin(matchup.get('margin_victory'))
+            rows.append((week, matchup['team_key'], matchup['team_name'], points,
+                         matchup['opponent_team_key'], matchup['opponent_name'], opponent_points,
+                         margin, matchup.get('winning_team')))
+            rows.append((week, matchup['opponent_team_key'], matchup['opponent_name'], opponent_points,
+                         matchup['team_key'], matchup['team_name'], points,
+                         margin, matchup.get('winning_team')))
+        self.conn.executemany(
+            "INSERT OR REPLACE INTO matchups (week, team_key, team_name, points, opponent_key, "
+            "opponent_name, opponent_points, margin, winning_team) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            rows
+        )
+
+    def _save_teams(self, teams: List[Dict]) -> None:
+        self.conn.execute("DELETE FROM teams")
+        self.conn.executemany(
+            "INSERT OR REPLACE INTO teams (team_key, team_id, team_name, manager, season) "
+            "VALUES (?, ?, ?, ?, ?)",
+            [(team['team_key'], team.get('team_id'), team['team_name'], team.get('manager'),
+              team.get('season')) for team in teams]
+        )
+
+    def _save_skins(self, skins: Dict) -> None:
+        self.conn.execute("DELETE FROM skins")
+        rows = []
+        for team, wins in skins.items():
+            # Skip malformed entries
+            if not isinstance(wins, list):
+                continue
+            rows.extend((win['week_number'], team, win['margin_victory'], win['pot_winnings'])
+                        for win in wins)
+        self.conn.executemany(
+            "INSERT OR REPLACE INTO skins (week, team_name, margin, pot_winnings) VALUES (?, ?, ?, ?)",
+            rows
+        )
+
+    def get_team_scores(self, team_key: str) -> List[Tuple[int, float]]:
+        """Get (week, points) for every stored week a team played"""
+        with self._lock:
+            return self.conn.execute(
+                "SELECT week, points FROM matchups WHERE team_key = ? ORDER BY week", (team_key,)
+            ).fetchall()
+
+    def get_total_points(self, first_week: int = 1, last_week: int = 13) -> Dict[str, float]:
+        """Get total points per team name over a range of weeks"""
+        with self._lock:
+            rows = self.conn.execute(
+                "SELECT team_name, SUM(points) FROM matchups WHERE week BETWEEN ? AND ? "
+                "GROUP BY team_name", (first_week, last_week)
+            ).fetchall()
+        return {team: total for team, total in rows}
+
+    def get_week_scores(self, week: int) -> Dict[str, float]:
+        """Get points per team key for one week"""
+        with self._lock:
+            rows = self.conn.execute(
+                "SELECT team_key, points FROM matchups WHERE week = ?", (week,)
+            ).fetchall()
+        return dict(rows)
+
+    def get_skins_totals(self) -> Dict[str, Decimal]:
+        """Get total skins winnings per team"""
+        with self._lock:
+            rows = self.conn.execute(
+                "SELECT team_name, SUM(pot_winnings) FROM skins GROUP BY team_name ORDER BY MIN(week)"
+            ).fetchall()
+        return {team: Decimal(str(round(total, 2))) for team, total in rows}
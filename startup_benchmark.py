@@ -0,0 +1,106 @@
+"""Startup-time benchmark for the command line entry points
+
+Starts a fresh interpreter per run, so every measurement pays the full
+import cost a league member pays when running a command. Reports the median
+time to import each entry point, the heavy dependencies it pulled in, and
+optionally the wall time of a complete offline report.
+
+    python startup_benchmark.py --data-dir league_data
+"""
+from pathlib import Path
+from typing import Dict, List, Optional
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+import time
+
+from benchmark import get_commit
+
+ENTRY_POINTS = ['report', 'main', 'accounting', 'config_manager', 'storage_manager']
+# Dependencies a report-only command must not pay for
+HEAVY_MODULES = ['requests', 'requests_oauthlib', 'yaml', 'numpy']
+# Entry points that must stay free of the heavy modules
+LIGHT_ENTRY_POINTS = ['report', 'accounting', 'storage_manager']
+
+IMPORT_PROBE = """
+import json, sys, time
+start = time.perf_counter()
+import {module}
+seconds = time.perf_counter() - start
+print(json.dumps({{'seconds': seconds, 'loaded': [name for name in {heavy!r} if name in sys.modules]}}))
+"""
+
+def probe_import(module: str) -> Dict:
+    """Import one module in a fresh interpreter and report its cost"""
+    code = IMPORT_PROBE.format(module=module, heavy=HEAVY_MODULES)
+    result = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True,
+                            cwd=Path(__file__).parent, check=True)
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+def time_command(command: List[str]) -> float:
+    """Wall time of a whole command, interpreter start included"""
+    start = time.perf_counter()
+    subprocess.run(command, stdout=subprocess.DEVNULL, cwd=Path(__file__).parent, check=True)
+    return time.perf_counter() - start
+
+def run_benchmark(config_path: Path, repeats: int, data_dir: Optional[str] = None) -> Dict:
+    imports = {}
+    for module in ENTRY_POINTS:
+        probes = [probe_import(module) for _ in range(repeats)]
+        imports[module] = {
+            'seconds': round(statistics.median(probe['seconds'] for probe in probes), 4),
+            'loaded': probes[-1]['loaded'],
+        }
+
+    commands = {}
+    if data_dir:
+        # The first run compiles the config cache; the measured runs reuse it
+        report = [sys.executable, 'report.py', '--config', str(config_path), '--data-dir', data_dir]
+        time_command(report)
+        commands['report.py'] = round(statistics.median(time_command(report) for _ in range(repeats)), 4)
+
+    return {
+        'commit': get_commit(),
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'repeats': repeats,
+        'imports': imports,
+        'commands': commands,
+    }
+
+def print_results(results: Dict) -> None:
+    print(f"\n[*] Startup benchmark @ {results['commit']} (median of {results['repeats']})")
+    print("{:<20} {:>10}  {}".format("Import", "Seconds", "Heavy modules loaded"))
+    print("-" * 60)
+    for module, entry in results['imports'].items():
+        print("{:<20} {:>10.4f}  {}".format(module, entry['seconds'], ', '.join(entry['loaded']) or '-'))
+    for command, seconds in results['commands'].items():
+        print(f"[*] {command} wall time: {seconds:.4f}s")
+
+def main_cli() -> None:
+    parser = argparse.ArgumentParser(description='Command startup-time benchmark')
+    parser.add_argument('--config', type=Path, default=Path(__file__).parent / 'config.yaml',
+                        help='Path to config.yaml file')
+    parser.add_argument('--data-dir', help='Also time a full offline report over this data directory')
+    parser.add_argument('--repeats', type=int, default=5)
+    parser.add_argument('--output', type=Path, default=Path('startup_benchmark_results.jsonl'),
+                        help='Append results here so runs can be compared per commit')
+    args = parser.parse_args()
+
+    data_dir = str(Path(args.data_dir).resolve()) if args.data_dir else None
+    results = run_benchmark(args.config.resolve(), args.repeats, data_dir)
+    print_results(results)
+    with args.output.open('a') as f:
+        f.write(json.dumps(results) + '\n')
+
+    leaks = {module: results['imports'][module]['loaded'] for module in LIGHT_ENTRY_POINTS
+             if results['imports'][module]['loaded']}
+    for module, loaded in leaks.items():
+        print(f"[!] Importing {module} loaded {', '.join(loaded)}")
+    if leaks:
+        sys.exit(1)
+    print(f"[+] Results appended to {args.output}")
+
+if __name__ == "__main__":
+    main_cli()
@@ -1,60 +1,294 @@
 from pathlib import Path
 import json
-from typing import Any, Optional
+from typing import TYPE_CHECKING, Any, Dict, Iterator, List, Optional, Tuple
 from datetime import datetime
-import shutil
+from collections import OrderedDict
+from contextlib import contextmanager
+import os
+import threading
+from backup_store import BackupStore
+import serializers
+from serializers import Serializer
+from records import MatchupRecord, WeekTable
+
+if TYPE_CHECKING:
+    from config_manager import ConfigManager
+
+# Line that ends the header of a streamed season export and opens its weeks object
+SEASON_WEEKS_OPEN = b'"weeks":{'
+
+def _read_only(self, *args, **kwargs):
+    raise TypeError("Cached storage data is read-only; use load_data(..., mutable=True) to modify it")
+
+class FrozenDict(dict):
+    """Read-only dict handed out by the StorageManager read cache"""
+    __setitem__ = __delitem__ = __ior__ = _read_only
+    clear = pop = popitem = setdefault = update = _read_only
+
+    def __reduce__(self):
+        return (FrozenDict, (dict(self),))
+
+    def __copy__(self):
+        return thaw(self)
+
+    def __deepcopy__(self, memo):
+        return thaw(self)
+
+class FrozenList(list):
+    """Read-only list handed out by the StorageManager read cache"""
+    __setitem__ = __delitem__ = __iadd__ = __imul__ = _read_only
+    append = extend = insert = pop = remove = clear = sort = reverse = _read_only
+
+    def __reduce__(self):
+        return (FrozenList, (list(self),))
+
+    def __copy__(self):
+        return thaw(self)
+
+    def __deepcopy__(self, memo):
+        return thaw(self)
+
+def freeze(data: Any) -> Any:
+    """Recursively convert parsed JSON into read-only containers"""
+    if isinstance(data, dict):
+        return FrozenDict((key, freeze(value)) for key, value in data.items())
+    if isinstance(data, list):
+        return FrozenList(freeze(value) for value in data)
+    return data
+
+def thaw(data: Any) -> Any:
+    """Recursively copy read-only containers into plain mutable ones"""
+    if isinstance(data, dict):
+        return {key: thaw(value) for key, value in data.items()}
+    if isinstance(data, list):
+        return [thaw(value) for value in data]
+    return data
 
 class StorageManager:
     """Manages local storage for fantasy football league data"""
     
-    def __init__(self, base_dir: str = "league_data"):
+    def __init__(self, base_dir: str = "league_data", cache_max_bytes: int = 64 * 1024 * 1024,
+                 backup_keep: int = 5, backup_compress: bool = True,
+                 formats: Optional[Dict[str, str]] = None):
         self.base_dir = Path(base_dir)
+        # Serialization format per file class, see serializers.file_class
+        self.formats = dict(serializers.DEFAULT_FORMATS, **(formats or {}))
+        self._serializers: Dict[str, Serializer] = {}
         self.backup_dir = self.base_dir / "backups"
+        self.backup_keep = backup_keep
+        self.backup_compress = backup_compress
+        # Parsed files keyed by filename, validated against (mtime, size) on every read
+        self.cache_max_bytes = cache_max_bytes
+        self.cache_stats = {'hits': 0, 'misses': 0}
+        self._cache: OrderedDict = OrderedDict()
+        self._cache_bytes = 0
+        self._cache_lock = threading.Lock()
+        # Typed week tables keyed by filename, validated against file_signature
+        self._week_tables: Dict[str, tuple] = {}
+        # Writes buffered by an open transaction, flushed together on commit
+        self._pending: Optional[OrderedDict] = None
+        self._pending_version = 0
+        self._tx_depth = 0
+        self._tx_lock = threading.RLock()
         self._ensure_directories()
     
     def _ensure_directories(self) -> None:
         """Create necessary directories if they don't exist"""
         self.base_dir.mkdir(exist_ok=True)
         self.backup_dir.mkdir(exist_ok=True)
+        self.backups = BackupStore(self.backup_dir, self.backup_keep, self.backup_compress)
     
+    def serializer_for(self, filename: str) -> Serializer:
+        """Get the serializer configured for a file's class"""
+        file_class = serializers.file_class(filename)
+        if file_class not in self._serializers:
+            spec = self.formats.get(file_class, self.formats['default'])
+            self._serializers[file_class] = Serializer(spec)
+        return self._serializers[file_class]
+
     def _create_backup(self, file_path: Path) -> None:
         """Create a backup of a file before modification"""
-        if not file_path.exists():
-            return
-            
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        backup_path = self.backup_dir / f"{file_path.stem}_{timestamp}{file_path.suffix}"
-        shutil.copy2(file_path, backup_path)
-        
-        # Clean up old backups (keep last 5)
-        backups = sorted(self.backup_dir.glob(f"{file_path.stem}_*{file_path.suffix}"))
-        for old_backup in backups[:-5]:
-            old_backup.unlink()
+        self.backups.backup(file_path)
     
     def save_data(self, filename: str, data: Any) -> None:
-        """Save data to JSON file with backup"""
+        """Save data in its file class's format with backup
+
+        Inside a transaction the write is buffered until commit.
+        """
+        with self._tx_lock:
+            if self._pending is not None:
+                self._pending_version += 1
+                self._pending[filename] = (self._pending_version, freeze(data))
+                self._pending.move_to_end(filename)
+                return
+
         file_path = self.base_dir / filename
         self._create_backup(file_path)
-        
-        with file_path.open('w') as f:
-            json.dump(data, f, indent=4, default=str)
+        self._write_file(file_path, data)
+        self._sync_directory()
+
+    def _write_file(self, file_path: Path, data: Any) -> None:
+        """Write a file atomically: temp file, fsync, then rename over the original"""
+        self._invalidate(file_path.name)
+        content = self.serializer_for(file_path.name).dumps(data)
+        temp_path = file_path.with_name(f".{file_path.name}.tmp")
+        with temp_path.open('wb') as f:
+            f.write(content)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, file_path)
+
+    def _sync_directory(self) -> None:
+        """Make renames durable; directories cannot be opened for fsync on Windows"""
+        if os.name != 'posix':
+            return
+        dir_fd = os.open(self.base_dir, os.O_RDONLY)
+        try:
+            os.fsync(dir_fd)
+        finally:
+            os.close(dir_fd)
+
+    @contextmanager
+    def transaction(self):
+        """Buffer every save_data call and flush them together on success
+
+        Each file is backed up once and written with write-to-temp, fsync and
+        rename, so a crash never leaves half-written JSON behind. If the block
+        raises, buffered writes are discarded. Nested transactions join the
+        outermost one.
+        """
+        with self._tx_lock:
+            self._tx_depth += 1
+            if self._tx_depth == 1:
+                self._pending = OrderedDict()
+        try:
+            yield self
+        except BaseException:
+            with self._tx_lock:
+                self._tx_depth -= 1
+                if self._tx_depth == 0:
+                    self._pending = None
+            raise
+
+        with self._tx_lock:
+            self._tx_depth -= 1
+            if self._tx_depth > 0:
+                return
+            pending, self._pending = self._pending, None
+
+        for filename, (_, data) in pending.items():
+            file_path = self.base_dir / filename
+            self._create_backup(file_path)
+            self._write_file(file_path, data)
+        if pending:
+            self._sync_directory()
+
+    def _pending_data(self, filename: str) -> Optional[tuple]:
+        """Get an uncommitted write for a file in the open transaction"""
+        with self._tx_lock:
+            if self._pending is None:
+                return None
+            return self._pending.get(filename)
+
+    def _invalidate(self, filename: str) -> None:
+        """Drop a file from the read cache"""
+        with self._cache_lock:
+            entry = self._cache.pop(filename, None)
+            if entry:
+                self._cache_bytes -= entry[1]
+
+    def _cache_get(self, filename: str, signature: tuple) -> Optional[Any]:
+        """Return cached data if the file is unchanged since it was parsed"""
+        with self._cache_lock:
+            entry = self._cache.get(filename)
+            if not entry or entry[0] != signature:
+                self.cache_stats['misses'] += 1
+                return None
+            self._cache.move_to_end(filename)
+            self.cache_stats['hits'] += 1
+            return entry[2]
+
+    def _cache_put(self, filename: str, signature: tuple, data: Any) -> None:
+        """Cache parsed data, evicting least recently read files past the memory bound"""
+        size = signature[1]
+        if size > self.cache_max_bytes:
+            return
+        with self._cache_lock:
+            old = self._cache.pop(filename, None)
+            if old:
+                self._cache_bytes -= old[1]
+            self._cache[filename] = (signature, size, data)
+            self._cache_bytes += size
+            while self._cache_bytes > self.cache_max_bytes:
+                _, (_, evicted_size, _) = self._cache.popitem(last=False)
+                self._cache_bytes -= evicted_size
+
+    def clear_cache(self) -> None:
+        """Empty the read cache"""
+        with self._cache_lock:
+            self._cache.clear()
+            self._cache_bytes = 0
+            self._week_tables.clear()
     
-    def load_data(self, filename: str) -> Optional[Any]:
-        """Load data from JSON file"""
+    def load_data(self, filename: str, mutable: bool = False) -> Optional[Any]:
+        """Load data from a stored file in any supported format
+
+        Repeated reads of an unchanged file are served from memory as shared
+        read-only containers; pass mutable=True to get a private copy.
+        """
+        pending = self._pending_data(filename)
+        if pending is not None:
+            # Reads inside a transaction see its own uncommitted writes
+            return thaw(pending[1]) if mutable else pending[1]
+
         file_path = self.base_dir / filename
         
         try:
-            with file_path.open('r') as f:
-                return json.load(f)
+            stat = file_path.stat()
+            signature = (stat.st_mtime_ns, stat.st_size)
+            data = self._cache_get(filename, signature)
+            if data is None:
+                data = freeze(serializers.loads(file_path.read_bytes()))
+                self._cache_put(filename, signature, data)
+            return thaw(data) if mutable else data
         except FileNotFoundError:
             return None
-        except json.JSONDecodeError as e:
+        except ValueError as e:
             print(f"Error reading {filename}: {e}")
             # Attempt to restore from latest backup
             return self._restore_from_backup(filename)
     
+    def load_week(self, week: int) -> Optional[WeekTable]:
+        """Load a week's matchups as a typed columnar table, None if the week is missing"""
+        filename = f'week_{week}_matchup.json'
+        signature = self.file_signature(filename)
+        if signature is None:
+            return None
+        with self._cache_lock:
+            entry = self._week_tables.get(filename)
+        if entry and entry[0] == signature:
+            return entry[1]
+
+        table = WeekTable.from_rows(self.load_data(filename))
+        with self._cache_lock:
+            self._week_tables[filename] = (signature, table)
+        return table
+
+    def load_matchups(self, week: int) -> List[MatchupRecord]:
+        """Load a week's matchups as typed records"""
+        table = self.load_week(week)
+        return table.records() if table else []
+
     def _restore_from_backup(self, filename: str) -> Optional[Any]:
         """Attempt to restore data from most recent backup"""
+        content = self.backups.restore(filename)
+        if content is not None:
+            try:
+                return serializers.loads(content)
+            except ValueError:
+                return None
+
+        # Fall back to timestamped copies written before the content-addressed store
         backups = sorted(self.backup_dir.glob(f"{Path(filename).stem}_*{Path(filename).suffix}"))
         
         if not backups:
@@ -67,27 +301,99 @@ class StorageManager:
         except (FileNotFoundError, json.JSONDecodeError):
             return None
     
+    def file_signature(self, filename: str) -> Optional[tuple]:
+        """Get a cheap (mtime, size) fingerprint of a stored file, None if missing"""
+        pending = self._pending_data(filename)
+        if pending is not None:
+            return ('pending', pending[0])
+        try:
+            stat = (self.base_dir / filename).stat()
+        except FileNotFoundError:
+            return None
+        return (stat.st_mtime_ns, stat.st_size)
+
+    def data_signature(self, filenames: list[str]) -> tuple:
+        """Fingerprint a set of stored files so derived results can be memoized"""
+        return tuple(self.file_signature(filename) for filename in filenames)
+
     def list_weeks_data(self) -> list[str]:
-        """List all available week data files"""
-        return sorted([f.name for f in self.base_dir.glob("week_*.json")])
+        """List all available week data files, including uncommitted ones"""
+        weeks = {f.name for f in self.base_dir.glob("week_*.json")}
+        with self._tx_lock:
+            if self._pending:
+                weeks.update(name for name in self._pending
+                             if name.startswith('week_') and name.endswith('.json'))
+        return sorted(weeks)
     
     def export_season_data(self) -> None:
-        """Export all season data to a single file"""
-        season_data = {
+        """Stream all season data to a single file, one week at a time
+
+        The export is one JSON document laid out one week per line, so
+        iter_season_weeks can read it back lazily. It is written straight to
+        disk with an atomic rename instead of through save_data, which would
+        hold the whole season in memory.
+        """
+        season_file = f"season_{datetime.now().year}.json"
+        file_path = self.base_dir / season_file
+        header = {
             'teams': self.load_data('teams_info.json'),
-            'weeks': {},
             'skins': self.load_data('skins_winners.json'),
             'timestamp': datetime.now().isoformat()
         }
-        
-        # Collect all week data
-        for week_file in sorted(self.base_dir.glob("week_*.json")):
-            week_num = week_file.stem.split('_')[1]
-            season_data['weeks'][week_num] = self.load_data(week_file.name)
-        
-        # Save as single season file
-        season_file = f"season_{datetime.now().year}.json"
-        self.save_data(season_file, season_data)
+
+        self._create_backup(file_path)
+        self._invalidate(season_file)
+        temp_path = file_path.with_name(f".{season_file}.tmp")
+        with self.serializer_for(season_file).open_writer(temp_path) as f:
+            f.write(serializers.dumps_json(header)[:-1] + b',' + SEASON_WEEKS_OPEN)
+            separator = b'\n'
+            for week_file in self.list_weeks_data():
+                week_num = week_file.split('_')[1]
+                f.write(separator + serializers.dumps_json({week_num: self.load_data(week_file)})[1:-1])
+                separator = b',\n'
+            f.write(b'\n}}\n')
+        os.replace(temp_path, file_path)
+        self._sync_directory()
+
+    def _season_file(self, filename: Optional[str]) -> Path:
+        return self.base_dir / (filename or f"season_{datetime.now().year}.json")
+
+    def read_season_header(self, filename: Optional[str] = None) -> Optional[Dict]:
+        """Get the teams, skins and timestamp of a season export without reading its weeks"""
+        try:
+            with serializers.open_reader(self._season_file(filename)) as f:
+                line = f.readline().rstrip()
+                if line.endswith(SEASON_WEEKS_OPEN):
+                    return serializers.loads_json(line[:-len(SEASON_WEEKS_OPEN)].rstrip(b',') + b'}')
+                # Exports written before streaming are a single indented document
+                data = serializers.loads_json(line + f.read())
+        except FileNotFoundError:
+            return None
+        data.pop('weeks', None)
+        return data
+
+    def iter_season_weeks(self, filename: Optional[str] = None) -> Iterator[Tuple[str, Any]]:
+        """Yield (week, matchups) from a season export, parsing one week at a time"""
+        with serializers.open_reader(self._season_file(filename)) as f:
+            line = f.readline().rstrip()
+            if not line.endswith(SEASON_WEEKS_OPEN):
+                yield from serializers.loads_json(line + f.read()).get('weeks', {}).items()
+                return
+            for line in f:
+                line = line.rstrip().rstrip(b',')
+                if line == b'}}':
+                    break
+                yield from serializers.loads_json(b'{' + line + b'}').items()
+
+def setup_storage(config: 'ConfigManager', data_dir: Optional[str] = None) -> StorageManager:
+    """Create the storage backend selected in config"""
+    data_dir = data_dir or config.storage.data_dir
+    if config.storage.backend == 'sqlite':
+        from sqlite_storage import SQLiteStorageManager  # sqlite_storage imports this module
+        return SQLiteStorageManager(data_dir, config.storage.db_name, config.storage.formats)
+    return StorageManager(data_dir, backup_keep=config.storage.backup_keep,
+                          backup_compress=config.storage.backup_compress,
+                          formats=config.storage.formats)
 
 # Example usage:
 if __name__ == "__main__":
@@ -0,0 +1,139 @@
+from typing import Dict, Iterable, List, Optional, Tuple
+
+def replay_eliminations(roster: Dict[str, str], weeks: Iterable[Tuple]) -> List[Dict]:
+    """Replay survivor eliminations over (week, scores by team_key) pairs in plain Python"""
+    eliminations = []
+    alive = set(roster)
+    for week_label, week_scores in weeks:
+        if len(alive) <= 1:
+            break
+        active_scores = {key: points for key, points in week_scores.items() if key in alive}
+        if not active_scores:
+            continue
+        lowest = min(active_scores, key=active_scores.get)
+        alive.discard(lowest)
+        eliminations.append({'week': week_label, 'team_key': lowest,
+                             'team_name': roster[lowest], 'points': active_scores[lowest]})
+    return eliminations
+
+class SurvivorEngine:
+    """Survivor pool state that is updated week by week instead of replayed
+
+    Each week the lowest scoring team still alive is eliminated, until one
+    team remains. The state file keeps, for every processed week, the week
+    file's fingerprint, who was eliminated and who is still alive, so readers
+    get standings without opening any week files.
+    """
+
+    STATE_FILE = 'survivor_state.json'
+
+    def __init__(self, storage, regular_season_weeks: int = 13):
+        self.storage = storage
+        self.regular_season_weeks = regular_season_weeks
+
+    def _load_state(self, roster_signature: Optional[list]) -> List[Dict]:
+        """Load processed week entries, discarding them if the roster changed"""
+        state = self.storage.load_data(self.STATE_FILE, mutable=True)
+        if not state or state.get('roster_signature') != roster_signature:
+            return []
+        return state.get('weeks', [])
+
+    def _signature(self, filename: str) -> Optional[list]:
+        signature = self.storage.file_signature(filename)
+        return list(signature) if signature is not None else None
+
+    def _replay(self) -> Tuple[Optional[list], Dict[str, str], List[Dict], bool]:
+        """Bring the saved week entries up to date in memory
+
+        Returns the roster signature, the roster, the entries for every week
+        and whether any entry differs from the saved state.
+        """
+        teams_info = self.storage.load_data('teams_info.json') or []
+        roster = {team['team_key']: team['team_name'] for team in teams_info}
+        roster_signature = self._signature('teams_info.json')
+        entries = self._load_state(roster_signature)
+        signatures = [self._signature(f'week_{week}_matchup.json')
+                      for week in range(1, self.regular_season_weeks + 1)]
+
+        # Resume after the last week whose file is unchanged
+        start = 0
+        while start < min(len(entries), len(signatures)) and entries[start]['signature'] == signatures[start]:
+            start += 1
+        if start == len(signatures) and len(entries) == len(signatures):
+            return roster_signature, roster, entries, False
+
+        entries = entries[:start]
+        remaining = list(entries[-1]['remaining']) if entries else list(roster)
+
+        for week in range(start + 1, self.regular_season_weeks + 1):
+            entry = {'week': week, 'signature': signatures[week - 1], 'eliminated': None}
+            week_table = self.storage.load_week(week)
+            if week_table and len(remaining) > 1:
+                scores = {key: points for key, points in week_table.scores().items()
+                          if key in remaining}
+                if scores:
+                    lowest_team_key = min(scores, key=scores.get)
+                    remaining.remove(lowest_team_key)
+                    entry['eliminated'] = {
+                        'week': week_table.week,
+                        'team_key': lowest_team_key,
+                        'team_name': roster[lowest_team_key],
+                        'points': scores[lowest_team_key]
+                    }
+            entry['remaining'] = list(remaining)
+            entries.append(entry)
+        return roster_signature, roster, entries, True
+
+    def update(self) -> Dict:
+        """Process new or changed weeks, save the state and return the current standings"""
+        roster_signature, roster, entries, changed = self._replay()
+        if changed:
+            self.storage.save_data(self.STATE_FILE, {
+                'roster_signature': roster_signature,
+                'roster': roster,
+                'weeks': entries
+            })
+        return self._standings(roster, entries)
+
+    def current(self) -> Dict:
+        """Get up to date standings without writing the state file, for read-only reports"""
+        _, roster, entries, _ = self._replay()
+        return self._standings(roster, entries)
+
+    def standings(self) -> Dict:
+        """Get the elimination order, surviving teams and winner from saved state only"""
+        state = self.storage.load_data(self.STATE_FILE) or {}
+        return self._standings(state.get('roster', {}), state.get('weeks', []))
+
+    @staticmethod
+    def _standings(roster: Dict[str, str], entries: List[Dict]) -> Dict:
+        remaining = entries[-1]['remaining'] if entries else list(roster)
+        eliminations = [entry['eliminated'] for entry in entries if entry['eliminated']]
+        winner = roster[remaining[0]] if len(remaining) == 1 and eliminations else None
+        return {
+            'eliminations': eliminations,
+            'remaining': {key: roster[key] for key in remaining},
+            'winner': winner
+        }
+
+    def audit_replay(self) -> List[Dict]:
+        """Replay the whole season from week files
+
+        Uses the vectorized ScoreMatrix when numpy is installed. Compare the
+        result with standings() to audit the incremental state.
+        """
+        teams_info = self.storage.load_data('teams_info.json') or []
+        names = {team['team_key']: team['team_name'] for team in teams_info}
+        import score_matrix  # Loads numpy, so only for audits
+        if score_matrix.available():
+            matrix = score_matrix.ScoreMatrix.from_storage(self.storage,
+                                                           range(1, self.regular_season_weeks + 1))
+            return matrix.elimination_list(names)
+
+        weeks = []
+        for week in range(1, self.regular_season_weeks + 1):
+            week_table = self.storage.load_week(week)
+            if week_table:
+                weeks.append((week_table.week, week_table.scores()))
+
+        return replay_eliminations(names, weeks)
@@ -0,0 +1,127 @@
+"""Synthetic league data for benchmarking at scale
+
+Writes the same files a real season leaves behind (teams_info.json,
+week_N_matchup.json, skins_winners.json and payments.json) for any team
+count, season length and number of seasons, so accounting and storage can
+be exercised well beyond a 12 team, 13 week league without touching Yahoo.
+Output is deterministic for a given seed.
+
+    python synthetic_league.py --teams 32 --weeks 17 --seasons 5 --root synthetic_data
+"""
+from decimal import Decimal
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+import argparse
+import random
+
+from records import MatchupRecord, WeekTable
+from skins_engine import SkinsEngine
+from storage_manager import StorageManager
+
+MIN_TEAMS = 8
+MAX_TEAMS = 32
+FIRST_SEASON = 2010
+
+def round_robin(team_count: int, week: int) -> List[Tuple[int, int]]:
+    """Pairings for a week of a circle-method round robin, repeating once every team has met"""
+    rotation = list(range(1, team_count))
+    shift = (week - 1) % (team_count - 1)
+    teams = [0] + rotation[shift:] + rotation[:shift]
+    return [(teams[i], teams[team_count - 1 - i]) for i in range(team_count // 2)]
+
+def generate_teams(team_count: int, season: str, league_key: str) -> List[Dict]:
+    """Teams info in the layout stored by YahooFantasyAPI.get_team_info"""
+    return [{
+        'team_key': f'{league_key}.t.{team_id}',
+        'team_id': str(team_id),
+        'team_name': f'Team {team_id:02d}',
+        'manager': f'Manager {team_id:02d}',
+        'season': season
+    } for team_id in range(1, team_count + 1)]
+
+def generate_week(teams: List[Dict], week: int, strengths: List[float],
+                  rng: random.Random) -> List[Dict]:
+    """One week of matchups, each recorded once as main.record_matchup does"""
+    rows = []
+    for home, away in round_robin(len(teams), week):
+        home_points = round(max(40.0, rng.gauss(strengths[home], 22.0)), 2)
+        away_points = round(max(40.0, rng.gauss(strengths[away], 22.0)), 2)
+        opponent = {'team_key': teams[away]['team_key'], 'name': teams[away]['team_name'],
+                    'points': away_points}
+        rows.append(MatchupRecord.from_points(teams[home], week, home_points, opponent).to_dict())
+    return rows
+
+def skins_winners(weeks: List[List[Dict]], weekly_pot: float, min_margin: float) -> Dict[str, List[Dict]]:
+    """Rolling-pot skins results in the skins_winners.json layout"""
+    # Reuse the engine's winner rule without writing its checkpoint, so benchmarks start cold
+    engine = SkinsEngine(None, Decimal(str(weekly_pot)), min_margin, len(weeks))
+    entries = []
+    current_pot = engine.weekly_pot
+    for week, rows in enumerate(weeks, start=1):
+        entry = {'week': week, 'winner': None}
+        winner = engine.find_week_winner(WeekTable.from_rows(rows))
+        if winner:
+            entry.update(winner=winner['team'], margin_victory=float(winner['margin']),
+                         pot_winnings=float(current_pot))
+            current_pot = engine.weekly_pot
+        else:
+            current_pot += engine.weekly_pot
+        entries.append(entry)
+    return SkinsEngine.winners_from_entries(entries)
+
+def generate_league(data_dir: str, team_count: int = 12, weeks: int = 13, season: Optional[str] = None,
+                    seed: int = 0, buy_in: float = 200.0, weekly_pot: float = 10.0,
+                    min_margin: float = 20.0, paid_fraction: float = 0.75) -> StorageManager:
+    """Write one synthetic season into data_dir"""
+    if team_count % 2 or not MIN_TEAMS <= team_count <= MAX_TEAMS:
+        raise ValueError(f"Team count must be even and between {MIN_TEAMS} and {MAX_TEAMS}, got {team_count}")
+    if weeks < 1:
+        raise ValueError(f"Season must have at least one week, got {weeks}")
+
+    rng = random.Random(seed)
+    season = season or str(FIRST_SEASON)
+    storage = StorageManager(data_dir)
+    teams = generate_teams(team_count, season, f'{400 + seed % 100}.l.{1000 + seed}')
+    # Each team has a season-long scoring level so standings spread out realistically
+    strengths = [rng.gauss(110.0, 12.0) for _ in teams]
+
+    week_rows = [generate_week(teams, week, strengths, rng) for week in range(1, weeks + 1)]
+    payments = {team['team_name']: str(Decimal(str(buy_in)))
+                for team in teams if rng.random() < paid_fraction}
+
+    with storage.transaction():
+        storage.save_data('teams_info.json', teams)
+        for week, rows in enumerate(week_rows, start=1):
+            storage.save_data(f'week_{week}_matchup.json', rows)
+        storage.save_data(SkinsEngine.RESULTS_FILE, skins_winners(week_rows, weekly_pot, min_margin))
+        storage.save_data('payments.json', payments)
+    return storage
+
+def generate_seasons(root: str, team_count: int = 12, weeks: int = 13, seasons: int = 1,
+                     seed: int = 0, export: bool = True, **kwargs) -> List[Path]:
+    """Write several seasons, one data directory each, optionally with season exports"""
+    directories = []
+    Path(root).mkdir(parents=True, exist_ok=True)
+    for index in range(seasons):
+        data_dir = Path(root) / f'season_{FIRST_SEASON + index}'
+        storage = generate_league(str(data_dir), team_count, weeks, str(FIRST_SEASON + index),
+                                  seed + index, **kwargs)
+        if export:
+            storage.export_season_data()
+        directories.append(data_dir)
+    return directories
+
+def main_cli() -> None:
+    parser = argparse.ArgumentParser(description='Generate synthetic league data')
+    parser.add_argument('--root', default='synthetic_data', help='Directory to write seasons into')
+    parser.add_argument('--teams', type=int, default=12, help=f'Teams per league ({MIN_TEAMS}-{MAX_TEAMS}, even)')
+    parser.add_argument('--weeks', type=int, default=13, help='Regular season weeks')
+    parser.add_argument('--seasons', type=int, default=1)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    directories = generate_seasons(args.root, args.teams, args.weeks, args.seasons, args.seed)
+    print(f"[+] Wrote {len(directories)} seasons of {args.teams} teams x {args.weeks} weeks to {args.root}")
+
+if __name__ == "__main__":
+    main_cli()
@@ -0,0 +1,107 @@
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Optional
+import json
+import os
+import threading
+import time
+
+from requests_oauthlib import OAuth2Session
+
+from file_lock import FileLock
+
+class TokenBroker:
+    """Shares one Yahoo OAuth token between threads and processes through token.json
+
+    Refreshes happen under an exclusive lock on token.json.lock. A worker that
+    waited for the lock rereads the file first and reuses the token another
+    worker just refreshed, so a token is refreshed once however many workers
+    find it expiring, and token.json is never written by two of them at once.
+    """
+
+    def __init__(self, token_file: Path, client_id: str, client_secret: str, token_url: str,
+                 redirect_uri: str = 'oob', refresh_margin: float = 300):
+        self.token_file = Path(token_file)
+        self.client_id = client_id
+        self.client_secret = client_secret
+        self.token_url = token_url
+        self.redirect_uri = redirect_uri
+        # Tokens are renewed this many seconds before they expire
+        self.refresh_margin = refresh_margin
+        self.lock = FileLock(self.token_file.with_name(f"{self.token_file.name}.lock"))
+        # A FileLock holds one descriptor, so threads of this process take turns at it first
+        self._thread_lock = threading.Lock()
+
+    @contextmanager
+    def _locked(self):
+        """Hold the token exclusively against other threads and processes"""
+        with self._thread_lock, self.lock:
+            yield
+
+    def load(self) -> Optional[Dict]:
+        """Read the shared token; an expired one is kept for its refresh token"""
+        try:
+            with self.token_file.open('r') as f:
+                return json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+
+    def _write(self, token: Dict) -> None:
+        """Replace token.json atomically so readers never see a partial file"""
+        temp_path = self.token_file.with_name(f".{self.token_file.name}.{os.getpid()}.tmp")
+        with temp_path.open('w') as f:
+            json.dump(token, f, indent=4)
+        os.replace(temp_path, self.token_file)
+
+    def save(self, token: Dict) -> None:
+        """Store a token obtained by the interactive authorization flow"""
+        with self._locked():
+            self._write(token)
+
+    def expires_soon(self, token: Dict) -> bool:
+        """Check if a token expires within the refresh margin"""
+        return time.time() > token.get('expires_at', 0) - self.refresh_margin
+
+    def get_token(self) -> Optional[Dict]:
+        """Get a token valid beyond the refresh margin, renewing it with its refresh token if needed
+
+        Returns None when there is no refresh token and the user must authorize
+        again; raises if Yahoo rejects the refresh.
+        """
+        token = self.load()
+        if token and not self.expires_soon(token):
+            return token
+
+        with self._locked():
+            # Another thread or process may have refreshed while we waited for the lock
+            token = self.load()
+            if token and not self.expires_soon(token):
+                return token
+            if not token or not token.get('refresh_token'):
+                return None
+            token = self._refresh(token)
+            self._write(token)
+            return token
+
+    def _refresh(self, token: Dict) -> Dict:
+        """Exchange the refresh token for a new access token without user interaction"""
+        session = OAuth2Session(self.client_id, redirect_uri=self.redirect_uri, token=token)
+        refreshed = session.refresh_token(
+            self.token_url,
+            refresh_token=token['refresh_token'],
+            auth=(self.client_id, self.client_secret),
+            redirect_uri=self.redirect_uri
+        )
+        # Yahoo normally returns the refresh token again, but keep the old one if it doesn't
+        refreshed.setdefault('refresh_token', token['refresh_token'])
+        print("[+] Yahoo access token refreshed")
+        return refreshed
+
+    def invalidate(self, token: Optional[Dict]) -> None:
+        """Mark a token the API rejected as expired, unless another worker already replaced it"""
+        if not token:
+            return
+        with self._locked():
+            current = self.load()
+            if current and current.get('access_token') == token.get('access_token'):
+                self._write(dict(current, expires_at=0))
@@ -0,0 +1,167 @@
+"""Live watch mode for a week in progress
+
+Polls the week's league scoreboard and prints only the matchups that changed
+since the last poll, along with the current skins leader and the surviving
+teams in danger of elimination. Polling speeds up while scores are moving
+and backs off while they are not, and a token bucket caps the request rate
+however long the watch runs.
+
+    python watch.py --week 5 --jsonl live.jsonl
+"""
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional, TextIO
+import argparse
+import json
+import time
+
+import main
+from config_manager import ConfigManager
+from rate_limiter import RateLimiter
+from storage_manager import StorageManager
+from survivor_engine import SurvivorEngine
+from yahoo_api import YahooFantasyAPI
+
+def snapshot(matchups: List[Dict]) -> Dict[str, Dict]:
+    """Reduce a week's scoreboard to the fields watched, keyed by matchup"""
+    result = {}
+    for matchup in matchups:
+        teams = YahooFantasyAPI.get_matchup_teams(matchup)
+        key = '|'.join(sorted(team['team_key'] for team in teams))
+        leader, trailer = sorted(teams, key=lambda team: team['points'], reverse=True)
+        result[key] = {
+            'status': matchup.get('status'),
+            'teams': teams,
+            'leader': leader['name'] if leader['points'] > trailer['points'] else None,
+            'margin': round(leader['points'] - trailer['points'], 2)
+        }
+    return result
+
+def diff(previous: Dict[str, Dict], current: Dict[str, Dict]) -> List[Dict]:
+    """Get the matchups whose status or scores changed"""
+    return [matchup for key, matchup in current.items() if previous.get(key) != matchup]
+
+class Watcher:
+    """Adaptive scoreboard poller for one week"""
+
+    def __init__(self, yahoo_api: YahooFantasyAPI, storage: StorageManager, league_key: str, week: int,
+                 min_margin: float, min_interval: float = 30, max_interval: float = 600,
+                 requests_per_hour: float = 120, danger_count: int = 3,
+                 output: Optional[TextIO] = None):
+        self.yahoo_api = yahoo_api
+        self.storage = storage
+        self.league_key = league_key
+        self.week = week
+        self.min_margin = min_margin
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.interval = min_interval
+        self.danger_count = danger_count
+        self.output = output
+        # Caps polling at a steady rate however long the watch runs
+        self.budget = RateLimiter(requests_per_hour / 3600)
+        self.polls = 0
+        self._previous: Dict[str, Dict] = {}
+        self._previous_summary: Optional[Dict] = None
+
+    def emit(self, event: Dict) -> None:
+        """Write an event to the JSONL stream, if any"""
+        if self.output:
+            self.output.write(json.dumps({'time': datetime.now().isoformat(), 'week': self.week, **event}) + '\n')
+            self.output.flush()
+
+    def summarize(self, current: Dict[str, Dict]) -> Dict:
+        """Current skins leader and the lowest scoring teams still alive in survivor"""
+        skins = [matchup for matchup in current.values()
+                 if matchup['leader'] and matchup['margin'] >= self.min_margin]
+        skins_leader = max(skins, key=lambda matchup: matchup['margin'], default=None)
+
+        alive = SurvivorEngine(self.storage).standings()['remaining']
+        scores = [team for matchup in current.values() for team in matchup['teams']
+                  if not alive or team['team_key'] in alive]
+        danger = sorted(scores, key=lambda team: team['points'])[:self.danger_count]
+        return {
+            'skins_leader': ({'team': skins_leader['leader'], 'margin': skins_leader['margin']}
+                             if skins_leader else None),
+            'survivor_danger': [{'team': team['name'], 'points': team['points']} for team in danger]
+        }
+
+    def poll(self) -> bool:
+        """Fetch the scoreboard once and report changes; False once every matchup is final"""
+        self.budget.acquire()
+        matchups = self.yahoo_api.get_scoreboard(self.league_key, [self.week], fresh=True).get(self.week, [])
+        self.polls += 1
+        current = snapshot(matchups)
+        changed = diff(self._previous, current)
+
+        for matchup in changed:
+            team1, team2 = matchup['teams']
+            print(f"[*] {team1['name']} {team1['points']} vs {team2['name']} {team2['points']} "
+                  f"({matchup['status']})")
+            self.emit({'type': 'matchup', **matchup})
+
+        summary = self.summarize(current)
+        if summary != self._previous_summary:
+            if summary['skins_leader']:
+                print(f"[*] Skins leader: {summary['skins_leader']['team']} "
+                      f"by {summary['skins_leader']['margin']}")
+            danger = ', '.join(f"{team['team']} {team['points']}" for team in summary['survivor_danger'])
+            print(f"[*] Survivor danger: {danger}")
+            self.emit({'type': 'summary', **summary})
+        self._previous, self._previous_summary = current, summary
+
+        # Poll fast while scores move or games are live, back off while nothing changes
+        live = any(matchup['status'] == 'midevent' for matchup in current.values())
+        if changed and live:
+            self.interval = self.min_interval
+        else:
+            self.interval = min(self.max_interval, self.interval * 2)
+        return not current or any(matchup['status'] != 'postevent' for matchup in current.values())
+
+    def run(self, max_polls: Optional[int] = None) -> None:
+        """Poll until the week is final or max_polls is reached"""
+        print(f"[*] Watching week {self.week} of {self.league_key}")
+        while self.poll():
+            if max_polls and self.polls >= max_polls:
+                return
+            time.sleep(self.interval)
+        print(f"[+] Week {self.week} is final")
+        self.emit({'type': 'final'})
+
+def main_cli() -> None:
+    parser = argparse.ArgumentParser(description='Watch a week in progress')
+    parser.add_argument('--config', type=Path, default=main.get_default_config_path(),
+                        help='Path to config.yaml file')
+    parser.add_argument('--week', type=int, help="Week to watch; defaults to the league's current week")
+    parser.add_argument('--jsonl', type=Path, help='Append change events to this JSONL file')
+    parser.add_argument('--max-polls', type=int, help='Stop after this many polls')
+    args = parser.parse_args()
+
+    config = ConfigManager(args.config)
+    yahoo_api, storage = main.setup_apis(config)
+    game_key = config.league.game_key or yahoo_api.get_game_key()
+    if not game_key:
+        print("[!] Failed to get game key")
+        return
+    league_key = f"{game_key}.l.{config.league.league_id}"
+
+    week = args.week
+    if week is None:
+        league_info = yahoo_api.get_league_info(league_key)
+        if not league_info:
+            return
+        week = int(league_info['current_week'])
+
+    output = args.jsonl.open('a') if args.jsonl else None
+    try:
+        Watcher(yahoo_api, storage, league_key, week, config.game.skins_min_margin,
+                config.watch.min_interval, config.watch.max_interval, config.watch.requests_per_hour,
+                config.watch.survivor_danger, output).run(args.max_polls)
+    except KeyboardInterrupt:
+        print("\n[*] Stopped watching")
+    finally:
+        if output:
+            output.close()
+
+if __name__ == "__main__":
+    main_cli()
@@ -1,9 +1,15 @@
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, List, Tuple
 import time
-import json
+import random
+import threading
 from pathlib import Path
 import requests
+from requests.adapters import HTTPAdapter
 from requests_oauthlib import OAuth2Session
+from rate_limiter import RateLimiter
+from metrics import Metrics, NULL_METRICS
+from response_cache import ResponseCache
+from token_broker import TokenBroker
 
 class YahooFantasyAPI:
     """Handles all interactions with Yahoo Fantasy Sports API"""
@@ -13,58 +19,88 @@ class YahooFantasyAPI:
     TOKEN_URL = 'https://api.login.yahoo.com/oauth2/get_token'
     REDIRECT_URI = 'oob'
     SCOPE = 'fspt-r'
+    RETRY_STATUS_CODES = {500, 502, 503, 504}
+    THROTTLE_STATUS_CODES = {429, 999}  # Yahoo answers 999 when a client is throttled
     
-    def __init__(self, client_id: str, client_secret: str, token_file: str = 'token.json'):
+    def __init__(self, client_id: str, client_secret: str, token_file: str = 'token.json',
+                 rate_limiter: Optional[RateLimiter] = None,
+                 base_url: Optional[str] = None, timeout: float = 30, max_retries: int = 3,
+                 backoff_factor: float = 0.5, backoff_max: float = 30, pool_size: int = 10,
+                 response_cache: Optional[ResponseCache] = None, interactive: bool = True,
+                 metrics: Optional[Metrics] = None, token_refresh_margin: float = 300):
         self.client_id = client_id
         self.client_secret = client_secret
         self.token_file = Path(token_file)
+        # token.json is shared with every other worker and process through the broker
+        self.token_broker = TokenBroker(self.token_file, client_id, client_secret, self.TOKEN_URL,
+                                        self.REDIRECT_URI, token_refresh_margin)
         self.session: Optional[OAuth2Session] = None
         self.token: Optional[Dict] = None
+        self.rate_limiter = rate_limiter
+        # Unattended runs must fail instead of prompting for an authorization code
+        self.interactive = interactive
+        self.metrics = metrics or NULL_METRICS
+        # Transport settings
+        self.base_url = base_url or self.BASE_URL
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.backoff_factor = backoff_factor
+        self.backoff_max = backoff_max
+        self.pool_size = pool_size
+        self.response_cache = response_cache
+        # Per-run cache of each team's full matchups payload
+        self._matchups_cache: Dict[str, Dict] = {}
+        self.cache_stats = {'hits': 0, 'misses': 0}
+        self._cache_lock = threading.Lock()
+        self._game_info: Dict[str, Dict] = {}  # Keyed by 'nfl' or a past season's game key
         self._initialize_session()
 
     def _initialize_session(self) -> None:
         """Initialize OAuth session and load existing token if available"""
         self.token = self._load_token()
-        self.session = OAuth2Session(
+        self.session = self._create_session(self.token)
+
+    def _create_session(self, token: Optional[Dict] = None) -> OAuth2Session:
+        """Create an OAuth session with a connection pool sized for concurrent workers"""
+        session = OAuth2Session(
             self.client_id,
             redirect_uri=self.REDIRECT_URI,
             scope=self.SCOPE,
-            token=self.token
+            token=token
         )
+        adapter = HTTPAdapter(pool_connections=self.pool_size, pool_maxsize=self.pool_size)
+        session.mount('https://', adapter)
+        session.mount('http://', adapter)
+        return session
 
     def _load_token(self) -> Optional[Dict]:
-        """Load token from file if it exists and is valid"""
-        try:
-            if self.token_file.exists():
-                with self.token_file.open('r') as f:
-                    token = json.load(f)
-                if not self._is_token_expired(token):
-                    return token
-        except (json.JSONDecodeError, KeyError):
-            pass
-        return None
-
-    def _save_token(self, token: Dict) -> None:
-        """Save token to file"""
-        with self.token_file.open('w') as f:
-            json.dump(token, f, indent=4)
+        """Load the shared token; an expired one is kept for its refresh token"""
+        return self.token_broker.load()
 
     def _is_token_expired(self, token: Dict) -> bool:
-        """Check if token is expired"""
-        # Add buffer of 5 minutes to prevent edge cases
-        return time.time() > token.get('expires_at', 0) - 300
+        """Check if token is expired or about to expire"""
+        return self.token_broker.expires_soon(token)
 
     def authenticate(self) -> None:
         """Handle complete authentication flow"""
         if self.token and not self._is_token_expired(self.token):
             return
 
+        try:
+            # Reuses a token another worker refreshed, or renews it with the refresh token
+            token = self.token_broker.get_token()
+            if token:
+                self.token = token
+                self.session.token = token
+                return
+        except Exception as e:
+            print(f"[!] Token refresh failed: {e}")
+
+        if not self.interactive:
+            raise RuntimeError("No valid Yahoo token; run main.py once interactively to authorize")
+
         # Create new session for auth
-        self.session = OAuth2Session(
-            self.client_id,
-            redirect_uri=self.REDIRECT_URI,
-            scope=self.SCOPE
-        )
+        self.session = self._create_session()
 
         # Get authorization URL
         auth_url, _ = self.session.authorization_url(self.AUTH_URL)
@@ -81,34 +117,136 @@ class YahooFantasyAPI:
             client_secret=self.client_secret
         )
         
-        self._save_token(self.token)
+        self.token_broker.save(self.token)
+
+    def _backoff_delay(self, attempt: int, response: Optional[requests.Response] = None) -> float:
+        """Get the wait before a retry: Retry-After if given, else exponential backoff with full jitter"""
+        if response is not None:
+            retry_after = response.headers.get('Retry-After')
+            if retry_after and retry_after.isdigit():
+                return min(self.backoff_max, float(retry_after))
+        return random.uniform(0, min(self.backoff_max, self.backoff_factor * 2 ** attempt))
 
-    def _make_request(self, endpoint: str, params: Optional[Dict] = None) -> Dict:
-        """Make authenticated request to Yahoo API"""
+    def _send(self, url: str, params: Dict) -> requests.Response:
+        """Send a GET with timeout, rate limiting and retries, recording it in the metrics"""
+        if not self.metrics.enabled:
+            return self._send_attempts(url, params)[0]
+
+        endpoint = url[len(self.base_url) + 1:]
+        start = time.perf_counter()
+        try:
+            response, retries = self._send_attempts(url, params)
+        except requests.exceptions.RequestException:
+            self.metrics.observe_request(endpoint, time.perf_counter() - start, 'error',
+                                         retries=self.max_retries)
+            raise
+        self.metrics.observe_request(endpoint, time.perf_counter() - start, response.status_code,
+                                     len(response.content), retries)
+        return response
+
+    def _send_attempts(self, url: str, params: Dict) -> Tuple[requests.Response, int]:
+        """Send a GET, retrying transient failures; returns the response and the retry count"""
+        for attempt in range(self.max_retries + 1):
+            if self.rate_limiter:
+                self.rate_limiter.acquire()
+
+            response = None
+            try:
+                response = self.session.get(url, params=params, timeout=self.timeout)
+            except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as e:
+                if attempt == self.max_retries:
+                    raise
+                print(f"[!] Request to {url} failed ({e}), retrying...")
+            else:
+                if response.status_code in self.THROTTLE_STATUS_CODES:
+                    if self.rate_limiter:
+                        self.rate_limiter.throttle()
+                elif response.status_code not in self.RETRY_STATUS_CODES:
+                    if self.rate_limiter:
+                        self.rate_limiter.recover()
+                    return response, attempt
+                if attempt == self.max_retries:
+                    return response, attempt
+                print(f"[!] Yahoo returned {response.status_code} for {url}, retrying...")
+
+            time.sleep(self._backoff_delay(attempt, response))
+
+        return response, self.max_retries
+
+    def _make_request(self, endpoint: str, params: Optional[Dict] = None, fresh: bool = False) -> Dict:
+        """Make authenticated request to Yahoo API
+
+        fresh skips the response cache lookup for data that is changing live,
+        and stores the response only once it is final.
+        """
         if not params:
             params = {}
         params['format'] = 'json'
 
+        if self.response_cache and not fresh:
+            cached = self.response_cache.get(endpoint, params)
+            if cached is not None:
+                self.metrics.observe_cache_hit(endpoint)
+                return cached
+
         # Ensure valid token
         if not self.token or self._is_token_expired(self.token):
             self.authenticate()
 
-        url = f'{self.BASE_URL}/{endpoint}'
+        url = f'{self.base_url}/{endpoint}'
         
         try:
-            response = self.session.get(url, params=params)
-            response.raise_for_status()
-            return response.json()
-        except requests.exceptions.RequestException as e:
-            print(f"[!] API request failed: {e}")
+            response = self._send(url, params)
             if response.status_code == 401:
                 # Token might be invalid, try to reauthenticate
+                print("[!] API request unauthorized, reauthenticating")
+                # Mark the token expired everywhere but keep its refresh token
+                self.token_broker.invalidate(self.token)
+                self.token = dict(self.token or {}, expires_at=0)
                 self.authenticate()
-                response = self.session.get(url, params=params)
-                response.raise_for_status()
-                return response.json()
+                response = self._send(url, params)
+            response.raise_for_status()
+            payload = response.json()
+        except requests.exceptions.RequestException as e:
+            print(f"[!] API request failed: {e}")
             raise
 
+        if self.response_cache:
+            endpoint_class, permanent = self._classify_response(endpoint, payload)
+            # A fresh read never comes back to the cache, so writing live data would be wasted disk I/O
+            if permanent or not fresh:
+                self.response_cache.put(endpoint, params, payload, endpoint_class, permanent)
+        return payload
+
+    @classmethod
+    def _classify_response(cls, endpoint: str, payload: Dict) -> Tuple[str, bool]:
+        """Pick a response's cache TTL class and whether its content can no longer change"""
+        try:
+            content = payload['fantasy_content']
+            if endpoint.startswith('game/'):
+                return 'game', False
+            if endpoint.endswith('/teams'):
+                return 'teams', False
+            if endpoint.endswith('/standings'):
+                # Final standings never change once the season is over
+                return 'standings', str(content['league'][0].get('is_finished')) == '1'
+            if '/scoreboard' in endpoint:
+                weeks = cls._parse_scoreboard(payload)
+                return 'scoreboard', cls._all_postevent(m for ms in weeks.values() for m in ms)
+            if endpoint.endswith('/matchups'):
+                matchups = content['team'][1]['matchups']
+                return 'matchups', cls._all_postevent(
+                    entry['matchup'] for index, entry in matchups.items() if index != 'count')
+        except (KeyError, IndexError, TypeError, ValueError):
+            pass
+        return 'default', False
+
+    @staticmethod
+    def _all_postevent(matchups) -> bool:
+        """Check that there is at least one matchup and every matchup has finished"""
+        statuses = [matchup.get('status') for matchup in matchups]
+        return bool(statuses) and all(status == 'postevent' for status in statuses)
+
     def verify_league_access(self) -> bool:
         """Verify access to fantasy league"""
         try:
@@ -118,44 +256,131 @@ class YahooFantasyAPI:
             print(f"[!] League access verification failed: {e}")
             return False
 
+    def get_game_info(self, game_key: str = 'nfl') -> Optional[Dict]:
+        """Get NFL game metadata, the current season by default, fetched at most once per run"""
+        if game_key not in self._game_info:
+            try:
+                response = self._make_request(f'game/{game_key}')
+                self._game_info[game_key] = response['fantasy_content']['game'][0]
+            except (KeyError, IndexError) as e:
+                print(f"[!] Failed to get game info: {e}")
+                return None
+        return self._game_info[game_key]
+
     def get_game_key(self) -> Optional[str]:
         """Get current NFL game key"""
+        game_info = self.get_game_info()
+        return game_info.get('game_id') if game_info else None
+
+    def get_league_info(self, league_key: str) -> Optional[Dict]:
+        """Get league metadata such as current_week and is_finished, always fetched live"""
         try:
-            response = self._make_request('game/nfl')
-            return response['fantasy_content']['game'][0]['game_id']
+            response = self._make_request(f'league/{league_key}', fresh=True)
+            return response['fantasy_content']['league'][0]
         except (KeyError, IndexError) as e:
-            print(f"[!] Failed to get game key: {e}")
+            print(f"[!] Failed to get league info: {e}")
             return None
 
     def get_team_info(self, game_id: str, league_id: str) -> list:
-        """Get information for all teams in the league"""
+        """Get information for all teams in the league with one teams collection request"""
+        league_key = f'{game_id}.l.{league_id}'
+        try:
+            response = self._make_request(f'league/{league_key}/teams')
+            league_meta, league_data = response['fantasy_content']['league'][:2]
+            teams = league_data['teams']
+        except Exception as e:
+            print(f"[!] Error getting teams for league {league_key}: {e}")
+            return []
+
         teams_info = []
-        
-        for team_index in range(1, 13):  # Assuming 12 teams
-            team_key = f'{game_id}.l.{league_id}.t.{team_index}'
+        for index, entry in teams.items():
+            if index == 'count':  # Skip the count field
+                continue
             try:
-                response = self._make_request(f'team/{team_key}/matchups')
-                team_data = response['fantasy_content']['team'][0]
-                
+                team = entry['team']
+                managers = self._team_field(team, 'managers') or []
                 teams_info.append({
-                    'team_key': team_data[0]['team_key'],
-                    'team_id': team_data[1]['team_id'],
-                    'team_name': team_data[2]['name']
+                    'team_key': self._team_field(team, 'team_key'),
+                    'team_id': self._team_field(team, 'team_id'),
+                    'team_name': self._team_field(team, 'name'),
+                    'manager': managers[0]['manager'].get('nickname') if managers else None,
+                    'season': league_meta.get('season')
                 })
-                print(f"[+] Successfully added {team_data[2]['name']}")
-                
+                print(f"[+] Successfully added {teams_info[-1]['team_name']}")
             except Exception as e:
-                print(f"[!] Error processing team {team_index}: {e}")
+                print(f"[!] Error processing team {index}: {e}")
                 continue
                 
         return teams_info
 
+    @staticmethod
+    def _team_week_endpoint(team_key: str, week: int) -> str:
+        return f'team/{team_key}/matchups;weeks={week}'
+
+    def _get_team_week(self, team_key: str, week: int) -> Optional[Dict]:
+        """Get a team's finished week from its permanent single-week cache entry"""
+        if not self.response_cache:
+            return None
+        endpoint = self._team_week_endpoint(team_key, week)
+        cached = self.response_cache.get(endpoint, {'format': 'json'})
+        if cached is None:
+            return None
+        self.metrics.observe_cache_hit(endpoint)
+        return cached['fantasy_content']['team'][1]['matchups']['0']
+
+    def _get_team_matchups(self, team_key: str) -> Dict:
+        """Get every week's matchups for a team, fetching at most once per run
+
+        Completed seasons are persisted across runs by the response cache, which
+        stores team matchups permanently once every week is over. Mid-season,
+        each finished week is also cached on its own, so reruns only refetch
+        teams for the weeks still in play.
+        """
+        response = self._make_request(f'team/{team_key}/matchups')
+        team_meta = response['fantasy_content']['team'][0]
+        matchups = response['fantasy_content']['team'][1]['matchups']
+        entries = [entry for index, entry in matchups.items() if index != 'count']
+
+        if self.response_cache and not self._all_postevent(entry['matchup'] for entry in entries):
+            for entry in entries:
+                endpoint = self._team_week_endpoint(team_key, int(entry['matchup']['week']))
+                if (entry['matchup'].get('status') == 'postevent'
+                        and not self.response_cache.contains(endpoint, {'format': 'json'})):
+                    payload = {'fantasy_content': {'team': [team_meta, {'matchups': {'0': entry, 'count': 1}}]}}
+                    self.response_cache.put(endpoint, {'format': 'json'}, payload, 'matchups', True)
+        return matchups
+
+    def clear_matchups_cache(self) -> None:
+        """Drop cached matchups so the next lookup refetches from Yahoo"""
+        with self._cache_lock:
+            self._matchups_cache.clear()
+            self.cache_stats = {'hits': 0, 'misses': 0}
+
     def get_matchup_results(self, team_key: str, week: int) -> Optional[Dict]:
-        """Get matchup results for a specific team and week"""
+        """Get matchup results for a specific team and week
+
+        Lookups go to this run's copy of the team's matchups, then the team's
+        cached finished week, and only then to Yahoo for the whole payload.
+        """
         try:
-            response = self._make_request(f'team/{team_key}/matchups')
-            matchup_data = response['fantasy_content']['team'][1]['matchups'][str(week-1)]
-            return matchup_data
+            with self._cache_lock:
+                matchups = self._matchups_cache.get(team_key)
+                if matchups is not None:
+                    self.cache_stats['hits'] += 1
+                    return matchups[str(week-1)]
+
+            matchup = self._get_team_week(team_key, week)
+            if matchup is not None:
+                with self._cache_lock:
+                    self.cache_stats['hits'] += 1
+                return matchup
+
+            with self._cache_lock:
+                self.cache_stats['misses'] += 1
+            matchups = self._get_team_matchups(team_key)
+            with self._cache_lock:
+                self._matchups_cache[team_key] = matchups
+            return matchups[str(week-1)]
         except Exception as e:
             print(f"[!] Error getting matchup results: {e}")
             return None
@@ -163,13 +388,9 @@ class YahooFantasyAPI:
     def get_final_standings(self, game_key: str, league_id: str) -> List[Dict]:
         """Get top 3 final standings from Yahoo"""
         league_key = f"{game_key}.l.{league_id}"
-        url = f"{self.BASE_URL}/league/{league_key}/standings"
         
         try:
-            response = self.session.get(url, params={'format': 'json'})
-            response.raise_for_status()
-            
-            data = response.json()
+            data = self._make_request(f"league/{league_key}/standings")
             standings_data = data['fantasy_content']['league'][1]['standings'][0]['teams']
             
             # Process all teams and sort by rank
@@ -201,33 +422,104 @@ class YahooFantasyAPI:
             print(f"[!] Error getting standings: {e}")
             return []        
     def get_playoff_results(self, league_key: str) -> List[Dict]:
-        url = f"{self.BASE_URL}/league/{league_key}/scoreboard;week=16"
-        response = self.session.get(url)
-        if response.status_code != 200:
+        """Get championship and third place results from the week 16 scoreboard"""
+        try:
+            matchups = self.get_scoreboard(league_key, [16]).get(16, [])
+        except Exception as e:
+            print(f"[!] Error getting playoff results: {e}")
             return []
-            
-        matchups = response.json()['fantasy_content']['league'][1]['scoreboard']['0']['matchups']
+
         playoff_teams = []
         
         for matchup in matchups:
-            if matchup.get('is_playoffs') and matchup.get('playoff_tier'):
-                teams = matchup['teams']
-                team1 = teams['0']['team']
-                team2 = teams['1']['team']
+            if str(matchup.get('is_playoffs')) == '1' and matchup.get('playoff_tier'):
+                team1, team2 = self.get_matchup_teams(matchup)
                 
-                if matchup['playoff_tier'] == 1:  # Championship
-                    winner = team1 if float(team1[1]['team_points']) > float(team2[1]['team_points']) else team2
+                if int(matchup['playoff_tier']) == 1:  # Championship
+                    winner = team1 if team1['points'] > team2['points'] else team2
                     loser = team2 if winner == team1 else team1
                     playoff_teams.extend([
-                        {'rank': 1, 'name': winner[2]['name']},
-                        {'rank': 2, 'name': loser[2]['name']}
+                        {'rank': 1, 'name': winner['name']},
+                        {'rank': 2, 'name': loser['name']}
                     ])
-                elif matchup['playoff_tier'] == 2:  # Third place
-                    winner = team1 if float(team1[1]['team_points']) > float(team2[1]['team_points']) else team2
-                    playoff_teams.append({'rank': 3, 'name': winner[2]['name']})
+                elif int(matchup['playoff_tier']) == 2:  # Third place
+                    winner = team1 if team1['points'] > team2['points'] else team2
+                    playoff_teams.append({'rank': 3, 'name': winner['name']})
         
         return playoff_teams
 
+    @staticmethod
+    def _team_field(team: List, field: str) -> Any:
+        """Find a field in the metadata list Yahoo returns for a team"""
+        for entry in team[0]:
+            if isinstance(entry, dict) and field in entry:
+                return entry[field]
+        return None
+
+    @classmethod
+    def get_matchup_teams(cls, matchup: Dict) -> List[Dict]:
+        """Extract key, name and points for both teams in a matchup"""
+        teams = matchup['0']['teams']
+        return [
+            {
+                'team_key': cls._team_field(teams[side]['team'], 'team_key'),
+                'name': cls._team_field(teams[side]['team'], 'name'),
+                'points': float(teams[side]['team'][1]['team_points']['total'])
+            }
+            for side in ('0', '1')
+        ]
+
+    @staticmethod
+    def _parse_scoreboard(response: Dict) -> Dict[int, List[Dict]]:
+        """Group the matchups in a league scoreboard payload by week"""
+        matchups = response['fantasy_content']['league'][1]['scoreboard']['0']['matchups']
+        by_week: Dict[int, List[Dict]] = {}
+        for index, entry in matchups.items():
+            if index == 'count':  # Skip the count field
+                continue
+            matchup = entry['matchup']
+            by_week.setdefault(int(matchup['week']), []).append(matchup)
+        return by_week
+
+    def get_scoreboard(self, league_key: str, weeks: List[int], fresh: bool = False) -> Dict[int, List[Dict]]:
+        """Get every matchup for one or more weeks in a single league scoreboard request"""
+        by_week: Dict[int, List[Dict]] = {}
+        missing = list(weeks)
+
+        if self.response_cache and len(weeks) > 1 and not fresh:
+            # Serve finished weeks from their single-week cache entries
+            missing = []
+            for week in weeks:
+                cached = self.response_cache.get(f'league/{league_key}/scoreboard;week={week}',
+                                                 {'format': 'json'})
+                if cached is not None:
+                    self.metrics.observe_cache_hit(f'league/{league_key}/scoreboard;week={week}')
+                    by_week.update(self._parse_scoreboard(cached))
+                else:
+                    missing.append(week)
+            if not missing:
+                return by_week
+
+        week_list = ','.join(str(week) for week in missing)
+        response = self._make_request(f'league/{league_key}/scoreboard;week={week_list}', fresh=fresh)
+        fetched = self._parse_scoreboard(response)
+        by_week.update(fetched)
+
+        if self.response_cache and len(missing) > 1:
+            # Split multi-week responses so later runs can reuse each week on its own
+            for week, matchups in fetched.items():
+                self.response_cache.put(f'league/{league_key}/scoreboard;week={week}', {'format': 'json'},
+                                        self._scoreboard_payload(matchups), 'scoreboard',
+                                        self._all_postevent(matchups))
+        return by_week
+
+    @staticmethod
+    def _scoreboard_payload(matchups: List[Dict]) -> Dict:
+        """Wrap a week's matchups in the league scoreboard response shape"""
+        entries: Dict[str, Any] = {str(i): {'matchup': matchup} for i, matchup in enumerate(matchups)}
+        entries['count'] = len(matchups)
+        return {'fantasy_content': {'league': [{}, {'scoreboard': {'0': {'matchups': entries}}}]}}
+
 # Example usage:
 if __name__ == "__main__":
     import os